@@ -0,0 +1,146 @@
+import os
+import re
+
+from index import (is_entry_current, load_json_index, parse_note_date,
+                   save_json_index)
+from note import extract_section, read_note
+from tags import build_tag_trie, normalize_tag
+
+ACTIONS_FILE = "actions.json"
+ACTIONS_VERSION = 1
+
+ACTION_ITEM_PATTERN = re.compile(r"^\s*[-*]\s*\[(?P<done>[ xX])\]\s*(?P<text>.+?)\s*$")
+DETAILS_PATTERN = re.compile(r"\((?P<details>[^()]*:[^()]*)\)\s*$")
+
+
+def parse_action_items(summary) -> list:
+    """
+    Parses the action item lines written by summarize_note_file, such as
+    "- [ ] Send the runbook (owner: Alice, due: 2026-03-01)", into dicts with
+    task, owner, due and status keys. Unknown owners and due dates are None.
+    """
+    items = []
+    for line in summary.splitlines():
+        match = ACTION_ITEM_PATTERN.match(line)
+        if not match:
+            continue
+        task = match.group("text")
+        details = {}
+        details_match = DETAILS_PATTERN.search(task)
+        if details_match:
+            task = task[: details_match.start()].strip()
+            for part in details_match.group("details").split(","):
+                key, _, value = part.partition(":")
+                details[key.strip().lower()] = value.strip() or None
+        items.append(
+            {
+                "task": task,
+                "owner": details.get("owner"),
+                "due": details.get("due"),
+                "status": "open" if match.group("done") == " " else "done",
+            }
+        )
+    return items
+
+
+def load_action_table(notes_dir):
+    return load_json_index(notes_dir, ACTIONS_FILE, ACTIONS_VERSION, {"notes": {}})
+
+
+def save_action_table(notes_dir, table):
+    save_json_index(notes_dir, ACTIONS_FILE, table)
+
+
+def update_action_table(notes_dir, notes_metadata):
+    """
+    Brings the action item table in line with the metadata index.
+    Only notes whose mtime or size changed are read, so the table follows
+    summaries as they are regenerated. Returns the updated table.
+    """
+    table = load_action_table(notes_dir)
+    notes = table["notes"]
+    changed = False
+
+    for filename in list(notes):
+        if filename not in notes_metadata:
+            del notes[filename]
+            changed = True
+
+    for filename, entry in notes_metadata.items():
+        cached = notes.get(filename)
+        if is_entry_current(cached, entry):
+            continue
+        try:
+            content = read_note(os.path.join(notes_dir, filename)) or ""
+        except Exception as e:
+            print(f"Error reading {filename}: {e}")
+            continue
+        notes[filename] = {
+            "mtime": entry["mtime"],
+            "size": entry["size"],
+            "items": parse_action_items(extract_section(content, "Summary")),
+        }
+        changed = True
+
+    if changed:
+        save_action_table(notes_dir, table)
+    return table
+
+
+def filter_action_items(
+    table,
+    notes_metadata,
+    owner=None,
+    tags=None,
+    since=None,
+    due_before=None,
+    status="open",
+) -> list:
+    """
+    Returns (filename, item) pairs from the action table, sorted by due date.
+    owner matches case-insensitively, tags must all match the note (wildcards
+    such as client/acme/* work as in filter_notes_by_tags), since is
+    compared with the note date and due_before with the item's due date.
+    Items without a due date never match due_before. status may be "open",
+    "done" or "all". Only the table and the metadata index are consulted.
+    """
+    allowed = None
+    if tags:
+        trie = build_tag_trie(notes_metadata)
+        allowed = set.intersection(*[trie.match(normalize_tag(tag)) for tag in tags])
+
+    results = []
+    for filename, cached in table["notes"].items():
+        entry = notes_metadata.get(filename)
+        if entry is None or (allowed is not None and filename not in allowed):
+            continue
+        if since is not None:
+            note_date = parse_note_date(entry["date"])
+            if note_date is None or note_date < since:
+                continue
+        for item in cached["items"]:
+            if status != "all" and item["status"] != status:
+                continue
+            if owner and (item["owner"] or "").lower() != owner.lower():
+                continue
+            if due_before is not None:
+                due = parse_note_date(item["due"])
+                if due is None or due >= due_before:
+                    continue
+            results.append((filename, item))
+    results.sort(key=lambda result: (result[1]["due"] or "9999", result[0]))
+    return results
+
+
+def print_action_items(results):
+    if not results:
+        print("No action items found.")
+        return
+    print("Action items:")
+    for filename, item in results:
+        checkbox = "[x]" if item["status"] == "done" else "[ ]"
+        details = ", ".join(
+            f"{key}: {item[key]}" for key in ("owner", "due") if item[key]
+        )
+        details = f" ({details})" if details else ""
+        print(f"- {checkbox} {item['task']}{details} [{filename}]")
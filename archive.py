@@ -0,0 +1,249 @@
+import datetime
+import json
+import os
+import time
+import zlib
+
+from index import atomic_write, load_json_file, parse_note_date, read_note_metadata
+
+ARCHIVE_DIR = "archive"
+TABLE_FILE = "notes.json"
+ARCHIVE_VERSION = 1
+# The pack is compacted once the data of rewritten and restored notes makes up
+# more than this share of it.
+COMPACT_RATIO = 0.5
+
+
+def get_archive_dir(notes_dir):
+    return os.path.join(notes_dir, ARCHIVE_DIR)
+
+
+def get_pack_path(notes_dir, table):
+    """
+    Returns the path of the pack file the offset table points to.
+    """
+    return os.path.join(get_archive_dir(notes_dir), table["pack"])
+
+
+def load_archive_table(notes_dir):
+    """
+    Loads the offset table of the archive. Each entry records where a compressed
+    note lives in the pack file along with its metadata. dead counts the bytes
+    of the pack no longer pointed to by any entry.
+    """
+    table_file = os.path.join(get_archive_dir(notes_dir), TABLE_FILE)
+    return load_json_file(
+        table_file, ARCHIVE_VERSION, {"pack": "notes-1.pack", "notes": {}, "dead": 0}
+    )
+
+
+def save_archive_table(notes_dir, table):
+    table_file = os.path.join(get_archive_dir(notes_dir), TABLE_FILE)
+    atomic_write(table_file, json.dumps(table, indent=1, sort_keys=True))
+
+
+def list_archived_notes(notes_dir) -> dict:
+    """
+    Returns a mapping of archived filenames to their offset table entries.
+    """
+    return load_archive_table(notes_dir)["notes"]
+
+
+def is_archived(notes_dir, filename):
+    return filename in list_archived_notes(notes_dir)
+
+
+def read_archived_note(notes_dir, filename, table=None):
+    """
+    Decompresses a single note from the pack file without reading the others.
+    Returns None if the note is not archived.
+    """
+    if table is None:
+        table = load_archive_table(notes_dir)
+    entry = table["notes"].get(filename)
+    if entry is None:
+        return None
+    with open(get_pack_path(notes_dir, table), "rb") as f:
+        f.seek(entry["offset"])
+        data = f.read(entry["length"])
+    return zlib.decompress(data).decode("utf-8")
+
+
+def get_note_age_date(filepath, metadata):
+    """
+    Returns the date of a note from its front matter, falling back to its mtime.
+    """
+    note_date = parse_note_date(metadata.get("date"))
+    if note_date is None:
+        note_date = datetime.datetime.fromtimestamp(os.path.getmtime(filepath))
+    return note_date
+
+
+def archive_notes(notes_dir, days):
+    """
+    Moves notes older than the given number of days into the compressed pack.
+    Every note is compressed separately so it can be read back on its own.
+    Returns a sorted list of the archived filenames.
+    """
+    if not os.path.exists(notes_dir):
+        print("Notes directory not found.")
+        return []
+
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=days)
+    table = load_archive_table(notes_dir)
+    pack_file = get_pack_path(notes_dir, table)
+    os.makedirs(get_archive_dir(notes_dir), exist_ok=True)
+
+    archived = []
+    with open(pack_file, "ab") as pack:
+        for filename in sorted(os.listdir(notes_dir)):
+            if not filename.endswith(".md"):
+                continue
+            filepath = os.path.join(notes_dir, filename)
+            try:
+                metadata = read_note_metadata(filepath)
+                if get_note_age_date(filepath, metadata) >= cutoff:
+                    continue
+                with open(filepath, "rb") as f:
+                    raw = f.read()
+            except Exception as e:
+                print(f"Error reading {filepath}: {e}")
+                continue
+            data = zlib.compress(raw, 9)
+            offset = pack.tell()
+            pack.write(data)
+            metadata.update(
+                {
+                    "offset": offset,
+                    "length": len(data),
+                    "size": len(raw),
+                    "mtime": os.path.getmtime(filepath),
+                }
+            )
+            table["notes"][filename] = metadata
+            archived.append(filename)
+        pack.flush()
+        os.fsync(pack.fileno())
+
+    if archived:
+        # The table is written before the originals are removed so an
+        # interrupted run never loses a note.
+        save_archive_table(notes_dir, table)
+        for filename in archived:
+            os.remove(os.path.join(notes_dir, filename))
+    return archived
+
+
+def compact_pack(notes_dir, table):
+    """
+    Copies the remaining notes into a new pack file without the space left behind
+    by rewritten and restored notes, then points the table at it. Compressed data
+    is copied as is. The old pack is only removed once the new table has been saved.
+    """
+    old_pack = get_pack_path(notes_dir, table)
+    generation = int(table["pack"].split("-")[1].split(".")[0]) + 1
+    new_name = f"notes-{generation}.pack"
+    new_pack = os.path.join(get_archive_dir(notes_dir), new_name)
+
+    with open(new_pack, "wb") as out, open(old_pack, "rb") as src:
+        for filename in sorted(
+            table["notes"], key=lambda name: table["notes"][name]["offset"]
+        ):
+            entry = table["notes"][filename]
+            src.seek(entry["offset"])
+            data = src.read(entry["length"])
+            entry["offset"] = out.tell()
+            out.write(data)
+        out.flush()
+        os.fsync(out.fileno())
+
+    table["pack"] = new_name
+    table["dead"] = 0
+    save_archive_table(notes_dir, table)
+    os.remove(old_pack)
+
+
+def save_or_compact(notes_dir, table):
+    """
+    Saves the table after notes were rewritten or restored, compacting the pack
+    instead once the dead bytes make up more than COMPACT_RATIO of it. Until
+    then the pack is only ever appended to, so syncing it stays cheap.
+    """
+    pack_size = os.path.getsize(get_pack_path(notes_dir, table))
+    if table.get("dead", 0) > pack_size * COMPACT_RATIO:
+        compact_pack(notes_dir, table)
+    else:
+        save_archive_table(notes_dir, table)
+
+
+def rewrite_archived_notes(notes_dir, contents, metadata=None):
+    """
+    Replaces the content of archived notes. contents maps filenames to their new
+    text and metadata maps filenames to table fields to update, such as tags.
+    The new versions are appended to the pack and the old ones are counted as
+    dead bytes until the pack is compacted.
+    Returns a sorted list of the rewritten filenames.
+    """
+    metadata = metadata or {}
+    table = load_archive_table(notes_dir)
+    rewritten = []
+    with open(get_pack_path(notes_dir, table), "ab") as pack:
+        for filename, content in contents.items():
+            entry = table["notes"].get(filename)
+            if entry is None:
+                print(f"Note is not archived: {filename}")
+                continue
+            raw = content.encode("utf-8")
+            data = zlib.compress(raw, 9)
+            offset = pack.tell()
+            pack.write(data)
+            table["dead"] = table.get("dead", 0) + entry["length"]
+            entry.update(metadata.get(filename, {}))
+            # A new mtime makes caches keyed on mtime and size pick up the change.
+            entry.update(
+                {
+                    "offset": offset,
+                    "length": len(data),
+                    "size": len(raw),
+                    "mtime": time.time(),
+                }
+            )
+            rewritten.append(filename)
+        pack.flush()
+        os.fsync(pack.fileno())
+
+    if rewritten:
+        save_or_compact(notes_dir, table)
+    return sorted(rewritten)
+
+
+def unarchive_notes(notes_dir, filenames=None):
+    """
+    Restores archived notes to the notes directory. Restores every archived note
+    if no filenames are given. Returns a sorted list of the restored filenames.
+    """
+    table = load_archive_table(notes_dir)
+    if filenames is None:
+        filenames = list(table["notes"])
+
+    restored = []
+    for filename in filenames:
+        if filename not in table["notes"]:
+            print(f"Note is not archived: {filename}")
+            continue
+        filepath = os.path.join(notes_dir, filename)
+        if os.path.exists(filepath):
+            print(f"Note already exists, not restoring: {filename}")
+            continue
+        content = read_archived_note(notes_dir, filename, table)
+        atomic_write(filepath, content.encode("utf-8"))
+        mtime = table["notes"][filename]["mtime"]
+        os.utime(filepath, (mtime, mtime))
+        restored.append(filename)
+
+    if restored:
+        for filename in restored:
+            table["dead"] = table.get("dead", 0) + table["notes"][filename]["length"]
+            del table["notes"][filename]
+        save_or_compact(notes_dir, table)
+    return sorted(restored)
@@ -1,5 +1,8 @@
 import argparse
 
+from export import EXPORT_FORMATS
+from packing import DEFAULT_TOKEN_BUDGET
+
 
 def get_args():
 
@@ -21,37 +24,203 @@ def get_args():
         "filter", help="List notes that have all specified tag(s)"
     )
     parser_filter.add_argument(
-        "--tags", type=str, nargs="+", required=True, help="Tag(s) to filter notes by"
+        "--tags",
+        type=str,
+        nargs="+",
+        required=True,
+        help="Tag(s) to filter notes by, e.g. client/acme/* for a tag subtree",
+    )
+    parser_filter.add_argument(
+        "--all", action="store_true", help="Filter the notes of every notebook"
+    )
+
+    parser_query = subparsers.add_parser(
+        "query", help="List notes matching a query over tags, dates and text"
+    )
+    parser_query.add_argument(
+        "expression",
+        type=str,
+        help="Query, e.g. 'tag:acme AND date>=2026-01 AND text:\"rollback\" NOT tag:draft'",
+    )
+
+    parser_tags = subparsers.add_parser("tags", help="List all tags in use")
+    parser_tags.add_argument(
+        "--tree",
+        action="store_true",
+        help="Show hierarchical tags as a tree with note counts per subtree",
+    )
+    parser_tags.add_argument(
+        "--all", action="store_true", help="List the tags of every notebook"
+    )
+
+    parser_retag = subparsers.add_parser(
+        "retag", help="Rename, merge, add or remove tags across notes"
+    )
+    parser_retag.add_argument(
+        "--rename",
+        type=str,
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Rename a tag in every note that has it",
+    )
+    parser_retag.add_argument(
+        "--merge", type=str, nargs="+", help="Tags to merge into the --into tag"
+    )
+    parser_retag.add_argument("--into", type=str, help="Target tag for --merge")
+    parser_retag.add_argument(
+        "--add", type=str, nargs="+", help="Tag(s) to add to the selected notes"
+    )
+    parser_retag.add_argument(
+        "--remove", type=str, nargs="+", help="Tag(s) to remove from the selected notes"
+    )
+    parser_retag.add_argument(
+        "--tags",
+        type=str,
+        nargs="+",
+        help="Optional: Only change notes that have all of these tag(s)",
+    )
+
+    parser_dupes = subparsers.add_parser(
+        "dupes", help="Find notes that are near-duplicates of each other"
+    )
+    parser_dupes.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Minimum estimated similarity between 0 and 1 (default: 0.5)",
+    )
+    parser_dupes.add_argument(
+        "--merge",
+        action="store_true",
+        help="Offer to merge each duplicate pair into the older note",
     )
 
     parser_open = subparsers.add_parser(
         "open", help="Open a note using the default editor"
     )
 
-    subparsers.add_parser("list", help="List all notes in the repository")
+    parser_list = subparsers.add_parser("list", help="List all notes in the repository")
+    parser_list.add_argument(
+        "--all", action="store_true", help="List the notes of every notebook"
+    )
 
     parser_open.add_argument(
-        "--file", type=str, required=True, help="Filename of the note to open"
+        "--file",
+        type=str,
+        required=True,
+        help="Filename, index number or title search of the note to open",
     )
 
     parser_view = subparsers.add_parser(
         "view", help="View a note in the CLI with markdown rendering"
     )
     parser_view.add_argument(
+        "--file",
+        type=str,
+        help="Filename, index number or title search of the note to view",
+    )
+    parser_view.add_argument(
+        "--prefetch",
+        type=int,
+        nargs="?",
+        const=20,
+        metavar="COUNT",
+        help="Render the most recently modified notes (default: 20) into the "
+        "render cache in the background",
+    )
+
+    parser_backlinks = subparsers.add_parser(
+        "backlinks", help="List the notes that link to a note"
+    )
+    parser_backlinks.add_argument(
+        "--file",
+        type=str,
+        required=True,
+        help="Filename, index number or title search of the note",
+    )
+
+    parser_links = subparsers.add_parser(
+        "links", help="List the links of a note, or all broken links"
+    )
+    links_group = parser_links.add_mutually_exclusive_group(required=True)
+    links_group.add_argument(
+        "--file",
+        type=str,
+        help="Filename, index number or title search of the note",
+    )
+    links_group.add_argument(
+        "--broken",
+        action="store_true",
+        help="List links that do not point to an existing note",
+    )
+
+    parser_graph = subparsers.add_parser(
+        "graph", help="List the notes linked to a note within a number of steps"
+    )
+    parser_graph.add_argument(
         "--file",
         type=str,
         required=True,
-        help="Filename or index number of the note to view",
+        help="Filename, index number or title search of the note",
+    )
+    parser_graph.add_argument(
+        "--depth",
+        type=int,
+        default=1,
+        help="Number of link steps to follow in either direction (default: 1)",
     )
 
     parser_summarize = subparsers.add_parser(
         "summarize", help="Summarize a note and update its Summary section"
     )
-    parser_summarize.add_argument(
+    summarize_group = parser_summarize.add_mutually_exclusive_group(required=True)
+    summarize_group.add_argument(
         "--file",
         type=str,
-        required=True,
-        help="Filename or index number of the note to summarize",
+        nargs="+",
+        help="Filename(s), index number(s) or title search(es) of the note(s) to summarize",
+    )
+    summarize_group.add_argument(
+        "--tags",
+        type=str,
+        nargs="+",
+        help="Summarize every note that has all of these tag(s)",
+    )
+    parser_summarize.add_argument(
+        "--pack",
+        action="store_true",
+        help="Summarize several small notes per request to save requests and tokens",
+    )
+    parser_summarize.add_argument(
+        "--budget",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        help=f"Input token budget per packed request (default: {DEFAULT_TOKEN_BUDGET})",
+    )
+
+    parser_todo = subparsers.add_parser(
+        "todo", help="List action items extracted from note summaries"
+    )
+    parser_todo.add_argument("--owner", type=str, help="Only items for this owner")
+    parser_todo.add_argument(
+        "--tags", type=str, nargs="+", help="Only items from notes with these tag(s)"
+    )
+    parser_todo.add_argument(
+        "--since",
+        type=str,
+        help="Only items from notes dated on or after YYYY, YYYY-MM or YYYY-MM-DD",
+    )
+    parser_todo.add_argument(
+        "--due-before",
+        type=str,
+        help="Only items due before YYYY, YYYY-MM or YYYY-MM-DD",
+    )
+    parser_todo.add_argument(
+        "--status",
+        type=str,
+        choices=["open", "done", "all"],
+        default="open",
+        help="Item status to list (default: open)",
     )
 
     parser_sync = subparsers.add_parser(
@@ -62,20 +231,135 @@ def get_args():
         type=str,
         help="Optional: Override the configured remote repository URL",
     )
+    parser_sync.add_argument(
+        "--all",
+        action="store_true",
+        help="Sync every notebook that has a remote repository, several at a time",
+    )
+
+    parser_history = subparsers.add_parser(
+        "history", help="List the sync commits of the notes repository or of one note"
+    )
+    parser_history.add_argument(
+        "--file",
+        type=str,
+        help="Optional: Filename, index number or title search of the note",
+    )
+    parser_history.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Number of commits to list (default: 20)",
+    )
+
+    parser_changed = subparsers.add_parser(
+        "changed", help="List the notes changed in commits since a date"
+    )
+    parser_changed.add_argument(
+        "--since",
+        type=str,
+        required=True,
+        help="Number of days such as 7d, or a date as YYYY, YYYY-MM or YYYY-MM-DD",
+    )
+
+    parser_diff = subparsers.add_parser(
+        "diff", help="Show how a note differs from an earlier committed version"
+    )
+    parser_diff.add_argument(
+        "--file",
+        type=str,
+        required=True,
+        help="Filename, index number or title search of the note",
+    )
+    parser_diff.add_argument(
+        "--section",
+        type=str,
+        help="Optional: Only compare this section, e.g. Summary",
+    )
+    parser_diff.add_argument(
+        "--back",
+        type=int,
+        default=1,
+        help="Number of distinct committed versions to go back (default: 1)",
+    )
+
+    parser_export = subparsers.add_parser(
+        "export", help="Export notes to HTML or JSON pages with tag index pages"
+    )
+    parser_export.add_argument(
+        "--output", type=str, required=True, help="Directory to write the export to"
+    )
+    parser_export.add_argument(
+        "--format",
+        type=str,
+        choices=EXPORT_FORMATS,
+        default="html",
+        help="Output format (default: html)",
+    )
+    parser_export.add_argument(
+        "--workers",
+        type=int,
+        help="Number of processes used to render changed notes (default: CPU count)",
+    )
+
+    parser_archive = subparsers.add_parser(
+        "archive", help="Move old notes into the compressed archive"
+    )
+    parser_archive.add_argument(
+        "--days",
+        type=int,
+        default=365,
+        help="Archive notes older than this many days (default: 365)",
+    )
+
+    parser_unarchive = subparsers.add_parser(
+        "unarchive", help="Restore archived notes to the notes directory"
+    )
+    unarchive_group = parser_unarchive.add_mutually_exclusive_group(required=True)
+    unarchive_group.add_argument(
+        "--file",
+        type=str,
+        nargs="+",
+        help="Filename(s) or index number(s) of the note(s) to restore",
+    )
+    unarchive_group.add_argument(
+        "--all", action="store_true", help="Restore every archived note"
+    )
 
     parser_settings = subparsers.add_parser(
         "settings", help="View or update configuration settings"
     )
     parser_settings.add_argument(
-        "--path", type=str, help="Set a new notes directory path"
+        "--path",
+        type=str,
+        help="Set a new notes directory path for the default notebook or --notebook",
     )
     parser_settings.add_argument(
         "--editor", type=str, help="Set the default editor (e.g., vim, nano, code)"
     )
     parser_settings.add_argument("--token", type=str, help="Set the OpenAI API token")
     parser_settings.add_argument(
-        "--git", type=str, help="Set the remote Git repository URL for syncing notes"
+        "--git",
+        type=str,
+        help="Set the remote Git repository URL of the default notebook or --notebook",
     )
+    parser_settings.add_argument(
+        "--add-notebook",
+        type=str,
+        nargs=2,
+        metavar=("NAME", "PATH"),
+        help="Add a named notebook stored in PATH",
+    )
+    parser_settings.add_argument(
+        "--remove-notebook", type=str, metavar="NAME", help="Remove a named notebook"
+    )
+
+    for subparser in subparsers.choices.values():
+        subparser.add_argument(
+            "--notebook",
+            type=str,
+            help="Optional: Name of the notebook to use instead of the default one",
+        )
 
     args = parser.parse_args()
     return args
@@ -5,6 +5,7 @@ import yaml
 CONFIG_DIR = os.path.expanduser("~/.nerd_notes")
 SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.yaml")
 DEFAULT_NOTES_DIR = os.path.join(CONFIG_DIR, "notes")
+DEFAULT_NOTEBOOK = "default"
 
 
 def load_settings():
@@ -26,6 +27,48 @@ def save_settings(settings):
         yaml.dump(settings, f)
 
 
+def get_notebooks(settings) -> dict:
+    """
+    Returns the notebooks in settings as a mapping of name to a dict with
+    notes_dir and git_remote. The top-level notes_dir and git_remote settings
+    form the default notebook; named notebooks live under the notebooks key.
+    Named notebooks without a notes_dir are reported and left out.
+    """
+    notebooks = {
+        DEFAULT_NOTEBOOK: {
+            "notes_dir": settings.get("notes_dir", DEFAULT_NOTES_DIR),
+            "git_remote": settings.get("git_remote"),
+        }
+    }
+    for name, notebook in (settings.get("notebooks") or {}).items():
+        # Notebooks may be written by hand, so skip entries without a directory.
+        if not isinstance(notebook, dict) or not notebook.get("notes_dir"):
+            print(f"Notebook {name} has no notes_dir in the settings; skipping it.")
+            continue
+        notebooks[name] = {
+            "notes_dir": os.path.expanduser(notebook.get("notes_dir")),
+            "git_remote": notebook.get("git_remote"),
+        }
+    return notebooks
+
+
+def get_notebook(settings, name=None):
+    """
+    Returns the notes_dir and git_remote of a notebook, or of the default
+    notebook if name is None. Returns None if there is no such notebook.
+    """
+    return get_notebooks(settings).get(name or DEFAULT_NOTEBOOK)
+
+
+def get_notes_dir(settings, name=None):
+    """
+    Returns the notes directory of a notebook, falling back to the default
+    notebook if there is no such notebook.
+    """
+    notebook = get_notebook(settings, name) or get_notebook(settings)
+    return notebook["notes_dir"]
+
+
 def print_config(settings):
     print("Current settings:")
     print(f"  Notes Directory: {settings.get('notes_dir')}")
@@ -33,14 +76,52 @@ def print_config(settings):
     print(f"  Git Remote: {settings.get('git_remote') or '(not set)'}")
     token_status = "set" if settings.get("openai_token") else "not set"
     print(f"  OpenAI Token: ({token_status})")
+    notebooks = get_notebooks(settings)
+    del notebooks[DEFAULT_NOTEBOOK]
+    if notebooks:
+        print("  Notebooks:")
+        for name, notebook in sorted(notebooks.items()):
+            remote = notebook["git_remote"] or "(no git remote)"
+            print(f"    {name}: {notebook['notes_dir']} {remote}")
+
+
+def add_notebook(name, path):
+    if name == DEFAULT_NOTEBOOK:
+        print(f"'{DEFAULT_NOTEBOOK}' is reserved. Use --path to change its directory.")
+        return
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        os.makedirs(path)
+    settings = load_settings()
+    notebooks = settings.get("notebooks") or {}
+    if not isinstance(notebooks.get(name), dict):
+        notebooks[name] = {}
+    notebooks[name]["notes_dir"] = path
+    settings["notebooks"] = notebooks
+    save_settings(settings)
+    print(f"Notebook {name} added: {path}")
+
+
+def remove_notebook(name):
+    settings = load_settings()
+    notebooks = settings.get("notebooks") or {}
+    if name not in notebooks:
+        print(f"No notebook named {name}.")
+        return
+    del notebooks[name]
+    save_settings(settings)
+    print(f"Notebook {name} removed. Its notes directory was left in place.")
 
 
-def set_notes_path(new_path):
+def set_notes_path(new_path, notebook=None):
     new_path = os.path.expanduser(new_path)
     if not os.path.exists(new_path):
         os.makedirs(new_path)
     settings = load_settings()
-    settings["notes_dir"] = new_path
+    if notebook and notebook != DEFAULT_NOTEBOOK:
+        settings["notebooks"][notebook]["notes_dir"] = new_path
+    else:
+        settings["notes_dir"] = new_path
     save_settings(settings)
     print(f"Notes directory updated to: {new_path}")
 
@@ -59,8 +140,11 @@ def set_openai_token(token):
     print("OpenAI API token set.")
 
 
-def set_git_remote(remote):
+def set_git_remote(remote, notebook=None):
     settings = load_settings()
-    settings["git_remote"] = remote
+    if notebook and notebook != DEFAULT_NOTEBOOK:
+        settings["notebooks"][notebook]["git_remote"] = remote
+    else:
+        settings["git_remote"] = remote
     save_settings(settings)
     print("git remote url set.")
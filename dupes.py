@@ -0,0 +1,221 @@
+import hashlib
+import os
+import re
+
+from index import (atomic_write, is_entry_current, load_json_index,
+                   read_front_matter, save_json_index, split_front_matter)
+from note import (NOTE_SECTIONS, extract_section, load_notes_metadata,
+                  read_note, rewrite_note_tags, update_section)
+
+MINHASH_FILE = "minhash.json"
+MINHASH_VERSION = 1
+SIGNATURE_SIZE = 64
+BANDS = 16
+ROWS_PER_BAND = SIGNATURE_SIZE // BANDS
+SHINGLE_SIZE = 3
+BIN_RANGE = (1 << 32) // SIGNATURE_SIZE
+
+
+def similarity_text(content):
+    """
+    Returns the words of a note body that matter for duplicate detection.
+    Front matter, headings and the placeholder lines of the note template are
+    dropped so that two barely used notes do not look alike.
+    """
+    placeholders = {placeholder for _, placeholder in NOTE_SECTIONS}
+    lines = []
+    for line in split_front_matter(content)[1].splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and line not in placeholders:
+            lines.append(line)
+    return re.findall(r"\w+", " ".join(lines).lower())
+
+
+def shingle_hashes(words) -> set:
+    """
+    Hashes every run of SHINGLE_SIZE consecutive words to a 32-bit integer.
+    """
+    hashes = set()
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        shingle = " ".join(words[i : i + SHINGLE_SIZE]).encode("utf-8")
+        digest = hashlib.blake2b(shingle, digest_size=4).digest()
+        hashes.add(int.from_bytes(digest, "little"))
+    return hashes
+
+
+def minhash_signature(content):
+    """
+    Computes the MinHash signature of a note body.
+    Uses one permutation hashing: the shingle hashes are split into
+    SIGNATURE_SIZE bins by value and each bin keeps its minimum, so every
+    shingle is hashed once instead of once per signature slot. Empty bins
+    borrow the value of the next non-empty bin, offset by the distance to it.
+    Returns None for notes too short to have a single shingle.
+    """
+    hashes = shingle_hashes(similarity_text(content))
+    if not hashes:
+        return None
+    bins = [None] * SIGNATURE_SIZE
+    for value in hashes:
+        slot, rest = divmod(value, BIN_RANGE)
+        if bins[slot] is None or rest < bins[slot]:
+            bins[slot] = rest
+    signature = []
+    for slot in range(SIGNATURE_SIZE):
+        distance = 0
+        while bins[(slot + distance) % SIGNATURE_SIZE] is None:
+            distance += 1
+        value = bins[(slot + distance) % SIGNATURE_SIZE]
+        signature.append(value + distance * BIN_RANGE)
+    return signature
+
+
+def estimate_similarity(signature_a, signature_b):
+    """
+    Estimates the Jaccard similarity of two notes from their signatures.
+    """
+    equal = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return equal / len(signature_a)
+
+
+def load_signatures(notes_dir):
+    return load_json_index(notes_dir, MINHASH_FILE, MINHASH_VERSION, {"notes": {}})
+
+
+def save_signatures(notes_dir, signatures):
+    save_json_index(notes_dir, MINHASH_FILE, signatures)
+
+
+def update_signatures(notes_dir, notes_metadata):
+    """
+    Brings the stored signatures in line with the metadata index.
+    Only notes whose mtime or size changed are read and rehashed.
+    Returns a mapping of filenames to signatures, skipping notes without one.
+    """
+    signatures = load_signatures(notes_dir)
+    stored = signatures["notes"]
+    changed = False
+
+    for filename in list(stored):
+        if filename not in notes_metadata:
+            del stored[filename]
+            changed = True
+
+    for filename, entry in notes_metadata.items():
+        cached = stored.get(filename)
+        if is_entry_current(cached, entry):
+            continue
+        try:
+            content = read_note(os.path.join(notes_dir, filename))
+        except Exception as e:
+            print(f"Error reading {filename}: {e}")
+            continue
+        stored[filename] = {
+            "mtime": entry["mtime"],
+            "size": entry["size"],
+            "signature": minhash_signature(content or ""),
+        }
+        changed = True
+
+    if changed:
+        save_signatures(notes_dir, signatures)
+    return {
+        filename: cached["signature"]
+        for filename, cached in stored.items()
+        if cached["signature"] is not None
+    }
+
+
+def candidate_pairs(signatures) -> set:
+    """
+    Uses locality-sensitive hashing to find pairs of notes that share at least
+    one band of their signatures, without comparing every pair.
+    """
+    pairs = set()
+    for band in range(BANDS):
+        start = band * ROWS_PER_BAND
+        buckets = {}
+        for filename, signature in signatures.items():
+            key = tuple(signature[start : start + ROWS_PER_BAND])
+            buckets.setdefault(key, []).append(filename)
+        for bucket in buckets.values():
+            if len(bucket) < 2:
+                continue
+            bucket.sort()
+            for i, first in enumerate(bucket):
+                for second in bucket[i + 1 :]:
+                    pairs.add((first, second))
+    return pairs
+
+
+def find_duplicates(notes_dir, threshold=0.5) -> list:
+    """
+    Returns (similarity, filename, filename) tuples for pairs of notes whose
+    estimated similarity is at least the threshold, most similar first.
+    """
+    if not os.path.exists(notes_dir):
+        print("Notes directory not found.")
+        return []
+    signatures = update_signatures(notes_dir, load_notes_metadata(notes_dir))
+    duplicates = []
+    for first, second in candidate_pairs(signatures):
+        similarity = estimate_similarity(signatures[first], signatures[second])
+        if similarity >= threshold:
+            duplicates.append((similarity, first, second))
+    duplicates.sort(key=lambda duplicate: (-duplicate[0], duplicate[1], duplicate[2]))
+    return duplicates
+
+
+def list_section_titles(content):
+    return re.findall(r"^#\s*(.+?)\s*$", split_front_matter(content)[1], re.MULTILINE)
+
+
+def merge_note_contents(keep_content, other_content):
+    """
+    Appends each section of other_content to the matching section of
+    keep_content. Placeholder text and text already present are skipped, and
+    sections missing from keep_content are added at the end.
+    """
+    placeholders = {placeholder for _, placeholder in NOTE_SECTIONS}
+    merged = keep_content
+    for section_title in list_section_titles(other_content):
+        other_text = extract_section(other_content, section_title)
+        if not other_text or other_text in placeholders:
+            continue
+        keep_text = extract_section(merged, section_title)
+        if other_text in keep_text:
+            continue
+        if keep_text and keep_text not in placeholders:
+            other_text = f"{keep_text}\n\n{other_text}"
+        merged = update_section(merged, section_title, other_text)
+    return merged
+
+
+def merge_notes(notes_dir, keep, other):
+    """
+    Merges the sections and tags of the note other into the note keep, then
+    deletes other. Both notes must be in the notes directory, not archived.
+    Returns True if the notes were merged.
+    """
+    keep_file = os.path.join(notes_dir, keep)
+    other_file = os.path.join(notes_dir, other)
+    for note_file in (keep_file, other_file):
+        if not os.path.exists(note_file):
+            print(f"Note not found or archived: {os.path.basename(note_file)}")
+            return False
+
+    with open(keep_file, "r", encoding="utf-8") as f:
+        keep_content = f.read()
+    with open(other_file, "r", encoding="utf-8") as f:
+        other_content = f.read()
+
+    notes_metadata = load_notes_metadata(notes_dir)
+    tags = list(notes_metadata[keep]["tags"])
+    tags += [tag for tag in notes_metadata[other]["tags"] if tag not in tags]
+
+    merged = merge_note_contents(keep_content, other_content)
+    atomic_write(keep_file, merged.encode("utf-8"))
+    if read_front_matter(keep_file)[0]:
+        rewrite_note_tags(keep_file, tags)
+    os.remove(other_file)
+    return True
@@ -0,0 +1,400 @@
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+from markdown_it import MarkdownIt
+
+from index import (atomic_write, is_entry_current, load_json_file,
+                   save_json_file, split_front_matter)
+from note import NOTE_SECTIONS, extract_section, read_note, sanitize_title
+from tags import TAG_SEPARATOR, build_tag_trie
+
+EXPORT_FORMATS = ("html", "json")
+EXPORT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+NOTES_DIR = "notes"
+TAGS_DIR = "tags"
+# Below this many changed notes, starting worker processes costs more than
+# rendering in the current process.
+PARALLEL_THRESHOLD = 64
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+<nav><a href="{root}index.html">All notes</a></nav>
+{content}
+</body>
+</html>
+"""
+
+_markdown = None
+
+
+def get_markdown():
+    global _markdown
+    if _markdown is None:
+        _markdown = MarkdownIt("commonmark", {"html": False}).enable("table")
+    return _markdown
+
+
+def slugify(text):
+    """
+    Returns the anchor id used for a heading, e.g. "Raw Notes" -> "raw-notes".
+    """
+    return sanitize_title(text).lower() or "section"
+
+
+def get_note_path(filename, fmt):
+    return posixpath.join(NOTES_DIR, f"{filename[:-3]}.{fmt}")
+
+
+def get_tag_path(tag, fmt):
+    """
+    Returns the output path of a tag page. Hierarchical tags become nested
+    directories, so client/acme is written to tags/client/acme.html.
+    Each level is percent-encoded rather than sanitized, so tags such as c++
+    and c get different pages.
+    """
+    parts = [
+        quote(part, safe="").replace(".", "%2E") for part in tag.split(TAG_SEPARATOR)
+    ]
+    return posixpath.join(TAGS_DIR, *parts[:-1], f"{parts[-1]}.{fmt}")
+
+
+def get_root(page):
+    """
+    Returns the relative prefix from a page back to the output directory.
+    """
+    return "../" * page.count("/")
+
+
+def relative_href(target, page):
+    """
+    Returns the link from a page to a target, both relative to the output
+    directory. Index pages link to every note, so this avoids os.path.relpath.
+    """
+    return get_root(page) + quote(target)
+
+
+def render_markdown_html(body):
+    """
+    Renders a note body to HTML. Headings get id anchors derived from their
+    text, and relative links to other notes are pointed at their exported pages.
+    """
+    md = get_markdown()
+    tokens = md.parse(body)
+    used = set()
+    for position, token in enumerate(tokens):
+        if token.type == "heading_open":
+            anchor = base = slugify(tokens[position + 1].content)
+            suffix = 1
+            while anchor in used:
+                suffix += 1
+                anchor = f"{base}-{suffix}"
+            used.add(anchor)
+            token.attrSet("id", anchor)
+        elif token.type == "inline":
+            for child in token.children or []:
+                href = child.attrGet("href") if child.type == "link_open" else None
+                if href and href.endswith(".md") and "://" not in href:
+                    child.attrSet("href", href[:-3] + ".html")
+    return md.renderer.render(tokens, md.options, {})
+
+
+def render_note_html(filename, content, metadata):
+    page = get_note_path(filename, "html")
+    root = get_root(page)
+    body = split_front_matter(content)[1]
+    sections = [
+        f'<a href="#{slugify(section)}">{html.escape(section)}</a>'
+        for section, _ in NOTE_SECTIONS
+        if re.search(rf"^#\s*{re.escape(section)}\s*$", body, re.MULTILINE)
+    ]
+    tags = [
+        f'<a href="{relative_href(get_tag_path(tag, "html"), page)}">{html.escape(tag)}</a>'
+        for tag in metadata.get("tags") or []
+    ]
+    title = metadata.get("title") or filename[:-3]
+    header = f"<header>\n<h1>{html.escape(title)}</h1>\n"
+    if metadata.get("date"):
+        header += f'<p class="date">{html.escape(str(metadata["date"]))}</p>\n'
+    if tags:
+        header += f'<p class="tags">{" ".join(tags)}</p>\n'
+    if sections:
+        header += f'<nav class="sections">{" | ".join(sections)}</nav>\n'
+    header += "</header>\n"
+    return PAGE_TEMPLATE.format(
+        title=html.escape(title),
+        root=root,
+        content=header + f"<main>\n{render_markdown_html(body)}</main>",
+    )
+
+
+def render_note_json(filename, content, metadata):
+    body = split_front_matter(content)[1]
+    sections = [
+        {
+            "title": section,
+            "anchor": slugify(section),
+            "text": extract_section(body, section),
+        }
+        for section, _ in NOTE_SECTIONS
+    ]
+    return json.dumps(
+        {
+            "filename": filename,
+            "title": metadata.get("title"),
+            "date": metadata.get("date"),
+            "tags": metadata.get("tags") or [],
+            "sections": sections,
+            "body": body,
+        },
+        ensure_ascii=False,
+        indent=2,
+    )
+
+
+def export_note(job):
+    """
+    Renders one note and writes it to the output directory.
+    Runs in worker processes, so it takes a single picklable tuple.
+    """
+    output_dir, fmt, filename, content, metadata = job
+    if fmt == "html":
+        rendered = render_note_html(filename, content, metadata)
+    else:
+        rendered = render_note_json(filename, content, metadata)
+    path = os.path.join(output_dir, get_note_path(filename, fmt))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, rendered.encode("utf-8"))
+    return filename
+
+
+def build_note_list(notes, fmt) -> dict:
+    """
+    Prepares the list entry of every note once per export, so the index page
+    and large tag pages do not escape and quote the same notes again.
+    Maps each filename to a (sort key, quoted path, entry) tuple, where the
+    entry is a dict for JSON and an escaped (title, date) pair for HTML.
+    """
+    note_list = {}
+    for filename, entry in notes.items():
+        date = str(entry["date"] or "")
+        # Dates are compared by their digits so 20260101120000 and
+        # 2026-01-01 12:00:00 sort together.
+        sort_key = (re.sub(r"\D", "", date), filename)
+        path = quote(get_note_path(filename, fmt))
+        if fmt == "json":
+            item = {
+                "filename": filename,
+                "title": entry["title"],
+                "date": entry["date"],
+            }
+        else:
+            item = (html.escape(entry["title"] or filename[:-3]), html.escape(date))
+        note_list[filename] = (sort_key, path, item)
+    return note_list
+
+
+def render_note_list(filenames, note_list, page, fmt):
+    root = get_root(page)
+    entries = sorted(
+        (note_list[filename] for filename in filenames),
+        key=lambda entry: entry[0],
+        reverse=True,
+    )
+    if fmt == "json":
+        return [dict(item, path=root + path) for _, path, item in entries]
+    items = [
+        f'<li><a href="{root}{path}">{title}</a> {date}</li>'
+        for _, path, (title, date) in entries
+    ]
+    return "<ul>\n" + "\n".join(items) + "\n</ul>"
+
+
+def write_tag_page(output_dir, fmt, tag, node, note_list):
+    page = get_tag_path(tag, fmt)
+    filenames = node.subtree_notes()
+    if fmt == "json":
+        rendered = json.dumps(
+            {
+                "tag": tag,
+                "children": [
+                    f"{tag}{TAG_SEPARATOR}{child}" for child in sorted(node.children)
+                ],
+                "notes": render_note_list(filenames, note_list, page, fmt),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    else:
+        children = "".join(
+            f' <a href="{relative_href(get_tag_path(f"{tag}{TAG_SEPARATOR}{child}", fmt), page)}">'
+            f"{html.escape(child)}</a>"
+            for child in sorted(node.children)
+        )
+        content = f"<h1>Tag: {html.escape(tag)}</h1>\n"
+        if children:
+            content += f'<p class="subtags">Subtags:{children}</p>\n'
+        content += render_note_list(filenames, note_list, page, fmt)
+        rendered = PAGE_TEMPLATE.format(
+            title=html.escape(tag),
+            root=get_root(page),
+            content=content,
+        )
+    path = os.path.join(output_dir, page)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, rendered.encode("utf-8"))
+
+
+def write_index_page(output_dir, fmt, trie, note_list):
+    page = f"index.{fmt}"
+    tags = [(tag, len(node.subtree_notes())) for tag, node in trie.iter_tags()]
+    if fmt == "json":
+        rendered = json.dumps(
+            {
+                "tags": [
+                    {"tag": tag, "count": count, "path": get_tag_path(tag, fmt)}
+                    for tag, count in tags
+                ],
+                "notes": render_note_list(note_list, note_list, page, fmt),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+    else:
+        tag_links = "\n".join(
+            f'<li><a href="{relative_href(get_tag_path(tag, fmt), page)}">'
+            f"{html.escape(tag)}</a> ({count})</li>"
+            for tag, count in tags
+        )
+        rendered = PAGE_TEMPLATE.format(
+            title="Notes",
+            root="",
+            content=f"<h1>Tags</h1>\n<ul>\n{tag_links}\n</ul>\n"
+            f"<h1>Notes</h1>\n{render_note_list(note_list, note_list, page, fmt)}",
+        )
+    atomic_write(os.path.join(output_dir, page), rendered.encode("utf-8"))
+
+
+def remove_output(output_dir, path):
+    try:
+        os.remove(os.path.join(output_dir, path))
+    except FileNotFoundError:
+        pass
+
+
+def load_manifest(output_dir, fmt):
+    default = {"format": fmt, "notes": {}}
+    manifest_file = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = load_json_file(manifest_file, EXPORT_VERSION, default)
+    if manifest.get("format") != fmt:
+        return {"version": EXPORT_VERSION, **default}
+    return manifest
+
+
+def save_manifest(output_dir, manifest):
+    save_json_file(os.path.join(output_dir, MANIFEST_FILE), manifest)
+
+
+def tag_with_ancestors(tag):
+    parts = tag.split(TAG_SEPARATOR)
+    return {TAG_SEPARATOR.join(parts[:depth]) for depth in range(1, len(parts) + 1)}
+
+
+def export_notes(notes_dir, notes_metadata, output_dir, fmt="html", workers=None):
+    """
+    Exports notes to output_dir as HTML or JSON pages, with a page per tag and
+    an index page. The manifest in output_dir records each note's content hash,
+    so only notes that changed since the last export are rendered again. Notes
+    whose mtime and size match the manifest are not read at all. Tag pages and
+    the index page list titles, dates and tags only, so they are rewritten only
+    when those change or notes are added or removed. Large batches are rendered
+    in worker processes.
+    Returns a dict with the number of rendered, unchanged and removed notes.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir, fmt)
+    notes = manifest["notes"]
+    jobs = []
+    affected_tags = set()
+    manifest_changed = False
+    listing_changed = not os.path.exists(os.path.join(output_dir, f"index.{fmt}"))
+
+    removed = [filename for filename in notes if filename not in notes_metadata]
+    for filename in removed:
+        remove_output(output_dir, get_note_path(filename, fmt))
+        affected_tags.update(notes.pop(filename)["tags"])
+        listing_changed = True
+
+    for filename, entry in notes_metadata.items():
+        cached = notes.get(filename)
+        if is_entry_current(cached, entry):
+            continue
+        try:
+            content = read_note(os.path.join(notes_dir, filename))
+        except Exception as e:
+            print(f"Error reading {filename}: {e}")
+            continue
+        if content is None:
+            continue
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        metadata = {
+            "title": entry.get("title"),
+            "date": entry.get("date"),
+            "tags": entry.get("tags") or [],
+        }
+        manifest_changed = True
+        if cached is not None and cached["hash"] == digest:
+            cached.update(mtime=entry["mtime"], size=entry["size"])
+            continue
+        if cached is None or any(cached[key] != metadata[key] for key in metadata):
+            if cached is not None:
+                affected_tags.update(cached["tags"])
+            affected_tags.update(metadata["tags"])
+            listing_changed = True
+        notes[filename] = dict(
+            metadata, hash=digest, mtime=entry["mtime"], size=entry["size"]
+        )
+        jobs.append((output_dir, fmt, filename, content, metadata))
+
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) >= PARALLEL_THRESHOLD and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            list(executor.map(export_note, jobs, chunksize=chunksize))
+    else:
+        for job in jobs:
+            export_note(job)
+
+    if listing_changed:
+        trie = build_tag_trie(notes)
+        note_list = build_note_list(notes, fmt)
+        pages = set()
+        for tag in affected_tags:
+            pages |= tag_with_ancestors(tag)
+        for tag in sorted(pages):
+            node = trie.find(tag)
+            if node is None:
+                remove_output(output_dir, get_tag_path(tag, fmt))
+            else:
+                write_tag_page(output_dir, fmt, tag, node, note_list)
+        write_index_page(output_dir, fmt, trie, note_list)
+        manifest_changed = True
+
+    if manifest_changed:
+        save_manifest(output_dir, manifest)
+    return {
+        "rendered": len(jobs),
+        "unchanged": len(notes_metadata) - len(jobs),
+        "removed": len(removed),
+    }
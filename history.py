@@ -0,0 +1,215 @@
+import datetime
+import difflib
+import subprocess
+
+from index import load_json_index, save_json_index
+from query import parse_date_range
+
+HISTORY_FILE = "history.json"
+HISTORY_VERSION = 1
+FIELD_SEPARATOR = "\x1f"
+COMMIT_MARKER = "\x1e"
+
+
+class GitBatchReader:
+    """
+    Reads blobs through one long-lived `git cat-file --batch` process instead of
+    starting a subprocess per object. Use it as a context manager.
+    """
+
+    def __init__(self, repo_dir):
+        self.process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, object_name):
+        """
+        Returns the contents of an object such as "<commit>:<path>" as bytes,
+        or None if it does not exist.
+        """
+        self.process.stdin.write(object_name.encode("utf-8") + b"\n")
+        self.process.stdin.flush()
+        # The header is "<sha> <type> <size>", or "<object> missing" where the
+        # object name may itself contain spaces.
+        header = self.process.stdout.readline().split()
+        if len(header) != 3 or header[-1] == b"missing":
+            return None
+        size = int(header[2])
+        data = self.process.stdout.read(size)
+        self.process.stdout.read(1)
+        return data
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_git(repo_dir, *args):
+    return subprocess.run(
+        ["git", "-c", "core.quotePath=false", *args],
+        cwd=repo_dir,
+        capture_output=True,
+        text=True,
+    )
+
+
+def load_history_index(notes_dir):
+    return load_json_index(
+        notes_dir, HISTORY_FILE, HISTORY_VERSION, {"head": None, "commits": []}
+    )
+
+
+def save_history_index(notes_dir, history):
+    save_json_index(notes_dir, HISTORY_FILE, history)
+
+
+def read_commits(repo_dir, revision_range):
+    """
+    Returns the commits in revision_range, newest first, as dicts with sha,
+    time, subject and the paths they changed.
+    """
+    result = run_git(
+        repo_dir,
+        "log",
+        "--no-renames",
+        "--name-only",
+        f"--format={COMMIT_MARKER}%H{FIELD_SEPARATOR}%ct{FIELD_SEPARATOR}%s",
+        revision_range,
+    )
+    if result.returncode != 0:
+        return []
+    commits = []
+    for block in result.stdout.split(COMMIT_MARKER)[1:]:
+        lines = block.strip("\n").split("\n")
+        sha, timestamp, subject = lines[0].split(FIELD_SEPARATOR, 2)
+        commits.append(
+            {
+                "sha": sha,
+                "time": int(timestamp),
+                "subject": subject,
+                "paths": [line for line in lines[1:] if line],
+            }
+        )
+    return commits
+
+
+def update_history_index(notes_dir):
+    """
+    Brings the commit to changed paths index up to date with HEAD.
+    Only commits after the last indexed commit are read. If history was
+    rewritten so the last indexed commit is no longer an ancestor of HEAD,
+    the index is rebuilt. Returns the index, or None if notes_dir has no commits.
+    """
+    head = run_git(notes_dir, "rev-parse", "--verify", "HEAD")
+    if head.returncode != 0:
+        return None
+    head_sha = head.stdout.strip()
+
+    history = load_history_index(notes_dir)
+    if history["head"] == head_sha:
+        return history
+
+    last = history["head"]
+    if last is not None:
+        is_ancestor = run_git(notes_dir, "merge-base", "--is-ancestor", last, head_sha)
+        if is_ancestor.returncode != 0:
+            last = None
+    if last is None:
+        history["commits"] = read_commits(notes_dir, head_sha)
+    else:
+        history["commits"] = (
+            read_commits(notes_dir, f"{last}..{head_sha}") + history["commits"]
+        )
+    history["head"] = head_sha
+    save_history_index(notes_dir, history)
+    return history
+
+
+def get_file_history(history, filename) -> list:
+    """
+    Returns the commits that changed a note, newest first.
+    """
+    return [commit for commit in history["commits"] if filename in commit["paths"]]
+
+
+def get_changed_since(history, since) -> list:
+    """
+    Returns the sorted paths changed by commits made at or after since.
+    """
+    timestamp = since.timestamp()
+    paths = set()
+    for commit in history["commits"]:
+        if commit["time"] < timestamp:
+            # Commits are newest first, but clock skew between devices can
+            # reorder them, so keep scanning instead of stopping here.
+            continue
+        paths.update(commit["paths"])
+    return sorted(paths)
+
+
+def parse_since(value):
+    """
+    Parses a --since value: a number of days such as 7d, or a date as YYYY,
+    YYYY-MM or YYYY-MM-DD. Returns a datetime, or raises ValueError.
+    """
+    if value.endswith("d") and value[:-1].isdigit():
+        return datetime.datetime.now() - datetime.timedelta(days=int(value[:-1]))
+    try:
+        return parse_date_range(value)[0]
+    except ValueError:
+        raise ValueError(
+            f"Invalid date: {value} (use 7d, YYYY, YYYY-MM or YYYY-MM-DD)"
+        ) from None
+
+
+def get_previous_version(notes_dir, history, filename, current, revisions_back=1):
+    """
+    Returns (commit, content) for an earlier committed version of a note.
+    Versions identical to the current content are skipped, then revisions_back
+    selects how many distinct versions to go back. Returns None if there is no
+    such version.
+    """
+    seen = current
+    remaining = revisions_back
+    with GitBatchReader(notes_dir) as reader:
+        for commit in get_file_history(history, filename):
+            data = reader.read(f"{commit['sha']}:{filename}")
+            if data is None:
+                continue
+            content = data.decode("utf-8", errors="replace")
+            if content == seen:
+                continue
+            seen = content
+            remaining -= 1
+            if remaining == 0:
+                return commit, content
+    return None
+
+
+def diff_note_versions(old, new, filename, old_label) -> str:
+    """
+    Returns a unified diff between two versions of a note.
+    """
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            fromfile=f"{filename} ({old_label})",
+            tofile=f"{filename} (current)",
+        )
+    )
+
+
+def format_commit(commit):
+    date = datetime.datetime.fromtimestamp(commit["time"]).strftime("%Y-%m-%d %H:%M")
+    return f"{commit['sha'][:8]} {date} {commit['subject']}"
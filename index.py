@@ -0,0 +1,242 @@
+import datetime
+import json
+import os
+import tempfile
+
+import yaml
+
+from tags import normalize_tag
+
+INDEX_DIR = ".index"
+METADATA_FILE = "metadata.json"
+INDEX_VERSION = 1
+
+
+def get_index_dir(notes_dir):
+    """
+    Returns the directory holding the cached indexes for a notes directory.
+    """
+    return os.path.join(notes_dir, INDEX_DIR)
+
+
+def atomic_write(path, data):
+    """
+    Writes data to path through a temporary file in the same directory so
+    readers never see a partially written file.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    mode = "wb" if isinstance(data, bytes) else "w"
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+        # mkstemp creates files readable only by the owner.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_json_file(path, version, default):
+    """
+    Loads a versioned JSON file such as an index or table.
+    Returns default with the version added if the file does not exist, cannot
+    be read or was written with another version.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("version") == version:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": version, **default}
+
+
+def save_json_file(path, data):
+    atomic_write(path, json.dumps(data, separators=(",", ":")))
+
+
+def load_json_index(notes_dir, name, version, default):
+    """
+    Loads a JSON index from the index directory of the notes directory.
+    """
+    return load_json_file(
+        os.path.join(get_index_dir(notes_dir), name), version, default
+    )
+
+
+def save_json_index(notes_dir, name, data):
+    """
+    Atomically writes a JSON index to the index directory of the notes directory.
+    """
+    save_json_file(os.path.join(get_index_dir(notes_dir), name), data)
+
+
+def is_entry_current(cached, entry):
+    """
+    Returns True if a cached index entry was built from a note with the same
+    mtime and size as entry, so the note does not need to be read again.
+    """
+    return (
+        cached is not None
+        and cached.get("mtime") == entry["mtime"]
+        and cached.get("size") == entry["size"]
+    )
+
+
+def read_front_matter(filepath):
+    """
+    Reads only the YAML front matter block at the top of a note.
+    Returns the front matter text and the byte offset where the body starts.
+    Notes without front matter return an empty string and offset 0.
+    """
+    with open(filepath, "rb") as f:
+        first_line = f.readline()
+        if first_line.rstrip(b"\r\n") != b"---":
+            return "", 0
+        lines = []
+        while True:
+            line = f.readline()
+            if not line:
+                return "", 0
+            if line.rstrip(b"\r\n") == b"---":
+                return b"".join(lines).decode("utf-8"), f.tell()
+            lines.append(line)
+
+
+def split_front_matter(content):
+    """
+    Splits the text of a note into its YAML front matter block and its body,
+    the same way read_front_matter reads a file. Notes without front matter
+    return an empty string and the whole content.
+    """
+    lines = content.splitlines(keepends=True)
+    if not lines or lines[0].rstrip("\r\n") != "---":
+        return "", content
+    for position in range(1, len(lines)):
+        if lines[position].rstrip("\r\n") == "---":
+            return "".join(lines[1:position]), "".join(lines[position + 1 :])
+    return "", content
+
+
+def normalize_tags(note_tags):
+    """
+    Converts the tags value of a front matter block into a list of strings.
+    Accepts a YAML list or a comma separated string. Hierarchical tags are
+    normalized with normalize_tag.
+    """
+    if note_tags is None:
+        return []
+    if isinstance(note_tags, list):
+        tags = [tag if isinstance(tag, str) else str(tag) for tag in note_tags]
+    elif isinstance(note_tags, str):
+        tags = [tag.strip().strip('"') for tag in note_tags.split(",")]
+    else:
+        tags = [str(note_tags)]
+    tags = [normalize_tag(tag) for tag in tags]
+    return [tag for tag in tags if tag]
+
+
+def parse_note_date(date_str):
+    """
+    Parses the date stored in a note's front matter.
+    Accepts the timestamp format written by create_note as well as ISO dates.
+    Returns None if the date cannot be parsed.
+    """
+    if not date_str:
+        return None
+    for fmt in ("%Y%m%d%H%M%S", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def read_note_metadata(filepath):
+    """
+    Returns the title, date and tags of a note without reading its body.
+    """
+    front_matter, _ = read_front_matter(filepath)
+    data = yaml.safe_load(front_matter) if front_matter else None
+    if not isinstance(data, dict):
+        data = {}
+    return {
+        "title": str(data.get("title") or ""),
+        "date": str(data.get("date") or ""),
+        "tags": normalize_tags(data.get("tags")),
+    }
+
+
+def load_index(notes_dir):
+    """
+    Loads the metadata index for the notes directory.
+    Returns an empty index if it does not exist or cannot be read.
+    """
+    return load_json_index(notes_dir, METADATA_FILE, INDEX_VERSION, {"notes": {}})
+
+
+def save_index(notes_dir, index):
+    """
+    Atomically writes the metadata index for the notes directory.
+    """
+    save_json_index(notes_dir, METADATA_FILE, index)
+
+
+def set_index_entry(index, notes_dir, filename, metadata):
+    """
+    Records metadata for a single note together with its current mtime and size.
+    """
+    stat = os.stat(os.path.join(notes_dir, filename))
+    entry = dict(metadata)
+    entry["mtime"] = stat.st_mtime
+    entry["size"] = stat.st_size
+    index["notes"][filename] = entry
+
+
+def refresh_index(notes_dir):
+    """
+    Brings the metadata index up to date with the notes directory.
+    Only notes whose mtime or size changed since the last refresh are re-read.
+    Returns the refreshed index.
+    """
+    index = load_index(notes_dir)
+    notes = index["notes"]
+    changed = False
+    seen = set()
+
+    with os.scandir(notes_dir) as entries:
+        for dir_entry in entries:
+            filename = dir_entry.name
+            if not filename.endswith(".md") or not dir_entry.is_file():
+                continue
+            seen.add(filename)
+            stat = dir_entry.stat()
+            if is_entry_current(
+                notes.get(filename), {"mtime": stat.st_mtime, "size": stat.st_size}
+            ):
+                continue
+            try:
+                metadata = read_note_metadata(dir_entry.path)
+            except Exception as e:
+                print(f"Error reading {dir_entry.path}: {e}")
+                continue
+            metadata["mtime"] = stat.st_mtime
+            metadata["size"] = stat.st_size
+            notes[filename] = metadata
+            changed = True
+
+    for filename in list(notes):
+        if filename not in seen:
+            del notes[filename]
+            changed = True
+
+    if changed:
+        save_index(notes_dir, index)
+    return index
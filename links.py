@@ -0,0 +1,195 @@
+import os
+import re
+from collections import deque
+from urllib.parse import unquote
+
+from index import is_entry_current, load_json_index, save_json_index
+from note import extract_section, read_note, sanitize_title
+
+LINKS_FILE = "links.json"
+LINKS_VERSION = 1
+LINK_SECTION = "Connecting"
+
+WIKILINK_PATTERN = re.compile(r"\[\[([^\[\]|#]+)(?:#[^\[\]|]*)?(?:\|[^\[\]]*)?\]\]")
+MARKDOWN_LINK_PATTERN = re.compile(r"(?<!!)\[[^\]]*\]\(\s*<?([^)\s>]+)>?[^)]*\)")
+
+
+def extract_links(content) -> list:
+    """
+    Returns the raw link targets in the Connecting section of a note, in order.
+    Wikilinks such as [[Other Note|alias]] give their target name, Markdown
+    links give their relative path. External URLs and in-page anchors are skipped.
+    """
+    section = extract_section(content, LINK_SECTION)
+    targets = [match.strip() for match in WIKILINK_PATTERN.findall(section)]
+    for target in MARKDOWN_LINK_PATTERN.findall(section):
+        if re.match(r"^[a-zA-Z][\w+.-]*:", target) or target.startswith("#"):
+            continue
+        target = unquote(target.split("#", 1)[0])
+        if target:
+            targets.append(target)
+    return targets
+
+
+def build_resolver(notes_metadata) -> dict:
+    """
+    Maps every name a link may use for a note to its filename: the filename
+    with and without .md, the lowercased title, and the sanitized title that
+    create_note uses as the filename prefix.
+    """
+    names = {}
+    for filename in sorted(notes_metadata, reverse=True):
+        title = notes_metadata[filename].get("title") or ""
+        if title:
+            names[title.lower()] = filename
+            names[sanitize_title(title).lower()] = filename
+    for filename in notes_metadata:
+        names[filename.lower()] = filename
+        names[filename[:-3].lower()] = filename
+    return names
+
+
+def resolve_link(target, names):
+    """
+    Returns the filename a link target points to, or None if it is broken.
+    """
+    name = os.path.basename(os.path.normpath(target)).lower()
+    if name in names:
+        return names[name]
+    return names.get(target.strip().lower())
+
+
+def load_link_index(notes_dir):
+    return load_json_index(
+        notes_dir, LINKS_FILE, LINKS_VERSION, {"notes": {}, "reverse": {}}
+    )
+
+
+def save_link_index(notes_dir, link_index):
+    save_json_index(notes_dir, LINKS_FILE, link_index)
+
+
+def remove_edges(link_index, filename):
+    reverse = link_index["reverse"]
+    for _, target in link_index["notes"][filename]["links"]:
+        if target is None or target not in reverse:
+            continue
+        if filename in reverse[target]:
+            reverse[target].remove(filename)
+        if not reverse[target]:
+            del reverse[target]
+
+
+def add_edges(link_index, filename, raw_links, names):
+    links = [[raw, resolve_link(raw, names)] for raw in raw_links]
+    link_index["notes"][filename]["links"] = links
+    for _, target in links:
+        if target is not None:
+            sources = link_index["reverse"].setdefault(target, [])
+            if filename not in sources:
+                sources.append(filename)
+
+
+def update_link_index(notes_dir, notes_metadata):
+    """
+    Brings the link index in line with the metadata index.
+    Only changed notes are reread. When notes are added, removed or retitled,
+    the links that may now point elsewhere are resolved again from the index.
+    Returns the updated link index.
+    """
+    link_index = load_link_index(notes_dir)
+    notes = link_index["notes"]
+    names = build_resolver(notes_metadata)
+    changed = set()
+    names_changed = False
+
+    for filename in list(notes):
+        if filename not in notes_metadata:
+            remove_edges(link_index, filename)
+            del notes[filename]
+            names_changed = True
+
+    for filename, entry in notes_metadata.items():
+        cached = notes.get(filename)
+        if is_entry_current(cached, entry):
+            continue
+        if cached is None or cached["title"] != entry.get("title"):
+            names_changed = True
+        try:
+            content = read_note(os.path.join(notes_dir, filename)) or ""
+        except Exception as e:
+            print(f"Error reading {filename}: {e}")
+            continue
+        if cached is not None:
+            remove_edges(link_index, filename)
+        notes[filename] = {
+            "mtime": entry["mtime"],
+            "size": entry["size"],
+            "title": entry.get("title"),
+            "links": [],
+        }
+        add_edges(link_index, filename, extract_links(content), names)
+        changed.add(filename)
+
+    if names_changed:
+        for filename, cached in notes.items():
+            if filename in changed:
+                continue
+            links = cached["links"]
+            if any(resolve_link(raw, names) != target for raw, target in links):
+                remove_edges(link_index, filename)
+                add_edges(link_index, filename, [raw for raw, _ in links], names)
+                changed.add(filename)
+
+    if changed or names_changed:
+        save_link_index(notes_dir, link_index)
+    return link_index
+
+
+def get_links(link_index, filename) -> list:
+    """
+    Returns the sorted filenames a note links to.
+    """
+    entry = link_index["notes"].get(filename)
+    if entry is None:
+        return []
+    return sorted({target for _, target in entry["links"] if target is not None})
+
+
+def get_backlinks(link_index, filename) -> list:
+    """
+    Returns the sorted filenames of the notes linking to a note.
+    """
+    return sorted(link_index["reverse"].get(filename, []))
+
+
+def get_neighbourhood(link_index, filename, depth) -> dict:
+    """
+    Walks links in both directions from a note, up to depth steps away.
+    Returns a mapping of each reachable filename to its distance.
+    """
+    distances = {filename: 0}
+    queue = deque([filename])
+    while queue:
+        current = queue.popleft()
+        if distances[current] >= depth:
+            continue
+        for neighbour in get_links(link_index, current) + get_backlinks(
+            link_index, current
+        ):
+            if neighbour not in distances:
+                distances[neighbour] = distances[current] + 1
+                queue.append(neighbour)
+    return distances
+
+
+def get_broken_links(link_index) -> list:
+    """
+    Returns (filename, target) pairs for links that do not resolve to a note.
+    """
+    return sorted(
+        (filename, raw)
+        for filename, entry in link_index["notes"].items()
+        for raw, target in entry["links"]
+        if target is None
+    )
@@ -1,30 +1,58 @@
 import argparse
+import os
 
+from actions import (filter_action_items, print_action_items,
+                     update_action_table)
+from archive import (archive_notes, is_archived, list_archived_notes,
+                     unarchive_notes)
 from arg_parser import get_args
-from config import (DEFAULT_NOTES_DIR, load_settings, print_config, set_editor,
+from config import (add_notebook, get_notebook, get_notebooks, get_notes_dir,
+                    load_settings, print_config, remove_notebook, set_editor,
                     set_git_remote, set_notes_path, set_openai_token)
-from note import (create_note, filter_notes_by_tags, get_note_file,
-                  list_all_tags, list_notes, open_note, print_tags,
-                  summarize_note_file)
-from sync import sync_notes
+from dupes import find_duplicates, merge_notes
+from export import export_notes
+from history import (diff_note_versions, format_commit, get_changed_since,
+                     get_file_history, get_previous_version, parse_since,
+                     update_history_index)
+from links import (get_backlinks, get_broken_links, get_links,
+                   get_neighbourhood, update_link_index)
+from note import (create_note, extract_section, filter_notes_by_tags,
+                  get_note_file, list_all_tags, list_notes,
+                  load_notes_metadata, open_note, prefetch_renders, print_tags,
+                  read_note, retag_notes, summarize_note_file)
+from packing import summarize_notes_packed
+from query import parse_date_range, query_notes
+from sync import sync_notebooks, sync_notes
+from tags import build_tag_trie, print_tag_tree
 
 
 def execute_create_note(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    notes_dir = get_notes_dir(settings, args.notebook)
     create_note(args.title, args.tags, notes_dir)
 
 
 def execute_list_notes(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    if args.all:
+        for name, notebook in get_notebooks(settings).items():
+            print(f"[{name}]")
+            list_notes(notebook["notes_dir"])
+        return
+    notes_dir = get_notes_dir(settings, args.notebook)
     list_notes(notes_dir)
 
 
 def execute_change_settings(args):
     changed = False
+    if args.add_notebook:
+        add_notebook(*args.add_notebook)
+        changed = True
+    if args.remove_notebook:
+        remove_notebook(args.remove_notebook)
+        changed = True
     if args.path:
-        set_notes_path(args.path)
+        set_notes_path(args.path, args.notebook)
         changed = True
     if args.editor:
         set_editor(args.editor)
@@ -33,7 +61,7 @@ def execute_change_settings(args):
         set_openai_token(args.token)
         changed = True
     if args.git:
-        set_git_remote(args.git)
+        set_git_remote(args.git, args.notebook)
         changed = True
     if not changed:
         settings = load_settings()
@@ -44,21 +72,50 @@ def execute_change_settings(args):
 #     pass
 def execute_list_tags(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
-    all_tags = list_all_tags(notes_dir)
-    print_tags(all_tags)
+    if args.all:
+        notes_dirs = {
+            name: notebook["notes_dir"]
+            for name, notebook in get_notebooks(settings).items()
+        }
+    else:
+        notes_dirs = {args.notebook: get_notes_dir(settings, args.notebook)}
+    if args.tree:
+        # Notes are keyed by notebook as well, so equal filenames in different
+        # notebooks are counted separately.
+        notes_metadata = {
+            (name, filename): entry
+            for name, notes_dir in notes_dirs.items()
+            for filename, entry in load_notes_metadata(notes_dir).items()
+        }
+        print_tag_tree(build_tag_trie(notes_metadata))
+        return
+    all_tags = set()
+    for notes_dir in notes_dirs.values():
+        all_tags.update(list_all_tags(notes_dir))
+    print_tags(sorted(all_tags))
 
 
 def execute_print_tags(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    notes_dir = get_notes_dir(settings, args.notebook)
     all_tags = list_all_tags(notes_dir)
     print_tags(all_tags)
 
 
 def execute_filter_notes_by_tags(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    if args.all:
+        found = False
+        for name, notebook in get_notebooks(settings).items():
+            matching_notes = filter_notes_by_tags(notebook["notes_dir"], args.tags)
+            if matching_notes:
+                print(f"[{name}]")
+                list_notes(notebook["notes_dir"], matching_notes)
+                found = True
+        if not found:
+            print(f"No notes found with tags {args.tags} in any notebook.")
+        return
+    notes_dir = get_notes_dir(settings, args.notebook)
     matching_notes = filter_notes_by_tags(notes_dir, args.tags)
 
     if matching_notes:
@@ -67,17 +124,130 @@ def execute_filter_notes_by_tags(args):
         print(f"No notes found with tags {args.tags}.")
 
 
+def execute_query_notes(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    try:
+        matching_notes = query_notes(notes_dir, args.expression)
+    except ValueError as e:
+        print(f"Invalid query: {e}")
+        return
+
+    if matching_notes:
+        list_notes(notes_dir, matching_notes)
+    else:
+        print("No notes match the query.")
+
+
+def execute_find_duplicates(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    duplicates = find_duplicates(notes_dir, args.threshold)
+    if not duplicates:
+        print("No duplicate notes found.")
+        return
+
+    print("Possible duplicates:")
+    for similarity, first, second in duplicates:
+        print(f"{similarity:.2f} {first} <-> {second}")
+
+    if not args.merge:
+        return
+
+    notes_metadata = load_notes_metadata(notes_dir)
+    merged = set()
+    for similarity, first, second in duplicates:
+        if first in merged or second in merged:
+            continue
+        # Keep the older note and fold the newer one into it.
+        keep, other = sorted(
+            [first, second], key=lambda name: (notes_metadata[name]["date"], name)
+        )
+        try:
+            answer = input(f"Merge {other} into {keep}? [y/N] ").strip().lower()
+        except EOFError:
+            break
+        if answer == "y" and merge_notes(notes_dir, keep, other):
+            merged.add(other)
+            print(f"Merged {other} into {keep}.")
+
+
+def execute_retag_notes(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+
+    renames = {}
+    if args.rename:
+        renames[args.rename[0]] = args.rename[1]
+    if args.merge:
+        if not args.into:
+            print("--merge requires --into to name the target tag.")
+            return
+        for tag in args.merge:
+            renames[tag] = args.into
+
+    if not (renames or args.add or args.remove):
+        print("Nothing to do. Use --rename, --merge, --add or --remove.")
+        return
+
+    changed = retag_notes(notes_dir, renames, args.add, args.remove, args.tags)
+    if changed:
+        print(f"Retagged {len(changed)} note(s):")
+        for filename in changed:
+            print(f"- {filename}")
+    else:
+        print("No notes needed retagging.")
+
+
+def execute_archive_notes(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    archived = archive_notes(notes_dir, args.days)
+    if archived:
+        print(f"Archived {len(archived)} note(s) older than {args.days} days.")
+    else:
+        print("No notes to archive.")
+
+
+def execute_unarchive_notes(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+
+    filenames = None
+    if args.file:
+        filenames = []
+        for note_input in args.file:
+            note_file = get_note_file(note_input, notes_dir)
+            if note_file:
+                filenames.append(os.path.basename(note_file))
+
+    restored = unarchive_notes(notes_dir, filenames)
+    if restored:
+        print(f"Restored {len(restored)} note(s):")
+        for filename in restored:
+            print(f"- {filename}")
+    else:
+        print("No notes restored.")
+
+
 def execute_view_note(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    notes_dir = get_notes_dir(settings, args.notebook)
 
-    note_file = args.file
-    open_note(note_file, notes_dir, None)
+    if not args.file and args.prefetch is None:
+        print("Nothing to view. Use --file and/or --prefetch.")
+        return
+
+    if args.prefetch is not None:
+        prefetch_renders(notes_dir, args.prefetch)
+
+    if args.file:
+        open_note(args.file, notes_dir, None)
 
 
 def execute_open_note(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    notes_dir = get_notes_dir(settings, args.notebook)
     editor = settings.get("editor")
 
     if not editor:
@@ -88,35 +258,298 @@ def execute_open_note(args):
     open_note(note_file, notes_dir, editor)
 
 
+def get_link_index(notes_dir):
+    return update_link_index(notes_dir, load_notes_metadata(notes_dir))
+
+
+def execute_backlinks(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    note_file = get_note_file(args.file, notes_dir)
+    if not note_file:
+        return
+    filename = os.path.basename(note_file)
+
+    backlinks = get_backlinks(get_link_index(notes_dir), filename)
+    if backlinks:
+        print(f"Notes linking to {filename}:")
+        for source in backlinks:
+            print(f"- {source}")
+    else:
+        print(f"No notes link to {filename}.")
+
+
+def execute_links(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+
+    if args.broken:
+        broken_links = get_broken_links(get_link_index(notes_dir))
+        if broken_links:
+            print("Broken links:")
+            for filename, target in broken_links:
+                print(f"- {filename} -> {target}")
+        else:
+            print("No broken links found.")
+        return
+
+    note_file = get_note_file(args.file, notes_dir)
+    if not note_file:
+        return
+    filename = os.path.basename(note_file)
+
+    links = get_links(get_link_index(notes_dir), filename)
+    if links:
+        print(f"Notes linked from {filename}:")
+        for target in links:
+            print(f"- {target}")
+    else:
+        print(f"{filename} does not link to any notes.")
+
+
+def execute_graph(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    note_file = get_note_file(args.file, notes_dir)
+    if not note_file:
+        return
+    filename = os.path.basename(note_file)
+
+    distances = get_neighbourhood(get_link_index(notes_dir), filename, args.depth)
+    del distances[filename]
+    if not distances:
+        print(f"No notes linked to {filename}.")
+        return
+
+    print(f"Notes within {args.depth} link(s) of {filename}:")
+    for neighbour, distance in sorted(
+        distances.items(), key=lambda item: (item[1], item[0])
+    ):
+        print(f"{distance} {neighbour}")
+
+
 def execute_summary_note_file(args):
-    note_input = args.file
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
+    notes_dir = get_notes_dir(settings, args.notebook)
     openai_token = settings.get("openai_token")
 
     if not openai_token:
         print("No OpenAI API token set. Use the 'settoken' command to set one.")
         return
 
-    note_file = get_note_file(note_input, notes_dir)
+    if args.tags:
+        note_files = [
+            os.path.join(notes_dir, filename)
+            for filename in filter_notes_by_tags(notes_dir, args.tags)
+        ]
+    else:
+        note_files = [get_note_file(note_input, notes_dir) for note_input in args.file]
+    note_files = [note_file for note_file in note_files if note_file]
+
+    # Archived notes are read-only, so their summary cannot be written back.
+    archived = [
+        note_file
+        for note_file in note_files
+        if not os.path.exists(note_file)
+        and is_archived(notes_dir, os.path.basename(note_file))
+    ]
+    for note_file in archived:
+        print(
+            f"Skipping archived note: {os.path.basename(note_file)}. "
+            "Use the 'unarchive' command to summarize it."
+        )
+    note_files = [note_file for note_file in note_files if note_file not in archived]
+
+    if not note_files:
+        if not archived:
+            print("Note not found.")
+        return
+
+    if len(note_files) == 1 and not args.pack:
+        summary = summarize_note_file(note_files[0], openai_token)
 
-    if not note_file:
-        print("Note not found.")
+        if summary:
+            print("Summary updated successfully:")
+            print(summary)
+        else:
+            print("Failed to generate summary.")
+        return
+
+    if args.pack:
+        results = summarize_notes_packed(note_files, openai_token, args.budget)
+    else:
+        results = {
+            note_file: summarize_note_file(note_file, openai_token)
+            for note_file in note_files
+        }
+    for note_file, summary in results.items():
+        status = "updated" if summary else "failed"
+        print(f"- {os.path.basename(note_file)}: {status}")
+
+
+def execute_todo(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    try:
+        since = parse_date_range(args.since)[0] if args.since else None
+        due_before = parse_date_range(args.due_before)[0] if args.due_before else None
+    except ValueError as e:
+        print(e)
+        return
+
+    notes_metadata = load_notes_metadata(notes_dir)
+    table = update_action_table(notes_dir, notes_metadata)
+    results = filter_action_items(
+        table,
+        notes_metadata,
+        owner=args.owner,
+        tags=args.tags,
+        since=since,
+        due_before=due_before,
+        status=args.status,
+    )
+    print_action_items(results)
+
+
+def get_history_index(notes_dir):
+    history = update_history_index(notes_dir)
+    if history is None:
+        print("No commits found. Use the 'sync' command to commit your notes.")
+    return history
+
+
+def execute_history(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    history = get_history_index(notes_dir)
+    if history is None:
+        return
+
+    if args.file:
+        note_file = get_note_file(args.file, notes_dir)
+        if not note_file:
+            return
+        filename = os.path.basename(note_file)
+        commits = get_file_history(history, filename)
+        if not commits:
+            print(f"No commits changed {filename}.")
+            return
+        print(f"Commits that changed {filename}:")
+    else:
+        commits = history["commits"]
+
+    for commit in commits[: args.limit]:
+        print(format_commit(commit))
+
+
+def execute_changed(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    try:
+        since = parse_since(args.since)
+    except ValueError as e:
+        print(e)
+        return
+    history = get_history_index(notes_dir)
+    if history is None:
         return
 
-    summary = summarize_note_file(note_file, openai_token)
+    paths = [path for path in get_changed_since(history, since) if path.endswith(".md")]
+    if not paths:
+        print(f"No notes changed since {since:%Y-%m-%d}.")
+        return
+    archived = list_archived_notes(notes_dir)
+    print(f"Notes changed since {since:%Y-%m-%d}:")
+    for path in paths:
+        if os.path.exists(os.path.join(notes_dir, path)):
+            status = ""
+        elif path in archived:
+            status = " (archived)"
+        else:
+            status = " (deleted)"
+        print(f"- {path}{status}")
+
+
+def execute_diff(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    note_file = get_note_file(args.file, notes_dir)
+    if not note_file:
+        return
+    filename = os.path.basename(note_file)
+    history = get_history_index(notes_dir)
+    if history is None:
+        return
 
-    if summary:
-        print("Summary updated successfully:")
-        print(summary)
+    current = read_note(note_file)
+    if current is None:
+        return
+    previous = get_previous_version(notes_dir, history, filename, current, args.back)
+    if previous is None:
+        print(f"No earlier committed version of {filename} found.")
+        return
+    commit, content = previous
+
+    if args.section:
+        current = extract_section(current, args.section) + "\n"
+        content = extract_section(content, args.section) + "\n"
+    diff = diff_note_versions(content, current, filename, commit["sha"][:8])
+    print(format_commit(commit))
+    if diff:
+        print(diff, end="")
     else:
-        print("Failed to generate summary.")
+        print(f"The {args.section} section is unchanged.")
+
+
+def execute_export(args):
+    settings = load_settings()
+    notes_dir = get_notes_dir(settings, args.notebook)
+    output_dir = os.path.expanduser(args.output)
+    if os.path.abspath(output_dir) == os.path.abspath(notes_dir):
+        print("The export directory must not be the notes directory.")
+        return
+
+    result = export_notes(
+        notes_dir, load_notes_metadata(notes_dir), output_dir, args.format, args.workers
+    )
+    print(
+        f"Exported to {output_dir}: {result['rendered']} rendered, "
+        f"{result['unchanged']} unchanged, {result['removed']} removed."
+    )
+
+
+def execute_sync_all_notebooks(settings):
+    notebooks = {}
+    for name, notebook in get_notebooks(settings).items():
+        if notebook["git_remote"]:
+            notebooks[name] = (notebook["notes_dir"], notebook["git_remote"])
+        else:
+            print(f"Skipping {name}: no Git remote repository configured.")
+    if not notebooks:
+        print("No notebooks to sync.")
+        return
+
+    print(f"Syncing {len(notebooks)} notebook(s)...")
+    results = sync_notebooks(notebooks)
+    failed = 0
+    for name, (succeeded, message) in results.items():
+        print(f"- {name}: {'ok' if succeeded else 'FAILED'}, {message}")
+        failed += not succeeded
+    print(f"{len(results) - failed} synced, {failed} failed.")
 
 
 def execute_sync_notes(args):
     settings = load_settings()
-    notes_dir = settings.get("notes_dir", DEFAULT_NOTES_DIR)
-    repo = args.repo if args.repo else settings.get("git_remote")
+    if args.all:
+        if args.repo:
+            print("--repo cannot be combined with --all.")
+            return
+        execute_sync_all_notebooks(settings)
+        return
+    notes_dir = get_notes_dir(settings, args.notebook)
+    repo = (
+        args.repo if args.repo else get_notebook(settings, args.notebook)["git_remote"]
+    )
     if not repo:
         print(
             "No Git remote repository configured. Use the 'setgit' command or pass --repo to set one."
@@ -133,14 +566,35 @@ def main():
         "settings": execute_change_settings,
         "tags": execute_list_tags,
         "filter": execute_filter_notes_by_tags,
+        "query": execute_query_notes,
+        "dupes": execute_find_duplicates,
+        "retag": execute_retag_notes,
         "open": execute_open_note,
         "view": execute_view_note,
         "summarize": execute_summary_note_file,
+        "backlinks": execute_backlinks,
+        "links": execute_links,
+        "graph": execute_graph,
+        "todo": execute_todo,
+        "history": execute_history,
+        "changed": execute_changed,
+        "diff": execute_diff,
+        "export": execute_export,
         "sync": execute_sync_notes,
+        "archive": execute_archive_notes,
+        "unarchive": execute_unarchive_notes,
     }
 
     args = get_args()
 
+    if args.notebook and get_notebook(load_settings(), args.notebook) is None:
+        if not (args.command == "settings" and args.add_notebook):
+            print(
+                f"No notebook named {args.notebook}. "
+                "Use 'settings --add-notebook NAME PATH' to add one."
+            )
+            return
+
     command_handlers[args.command](args)
 
     # if args.command == "new":
@@ -1,12 +1,61 @@
+import array
+import bisect
 import datetime
+import itertools
+import json
+import mmap
 import os
 import re
+import shutil
+import struct
 import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import frontmatter
 import openai
 from rich.console import Console
-from rich.markdown import Markdown
+
+from archive import (is_archived, list_archived_notes, read_archived_note,
+                     rewrite_archived_notes)
+from index import (atomic_write, parse_note_date, read_front_matter,
+                   refresh_index, save_index, set_index_entry,
+                   split_front_matter)
+from render_cache import DEFAULT_CODE_THEME, get_rendered, print_markdown
+from tags import TAG_SEPARATOR, TagTrie, normalize_tag
+from titles import is_ambiguous, pick_note, search_titles, update_title_index
+
+NOTE_SECTIONS = [
+    ("Raw Notes", "- Start your note here."),
+    ("Processing", "*Add clarifications or additional context here.*"),
+    ("Connecting", "*Link related notes or external resources here.*"),
+    ("Summary", "*LLM-generated summary will appear here.*"),
+    ("Reflection", "*Your personal reflections here.*"),
+]
+
+
+# The action item lines are parsed back out of the Summary section by actions.py.
+ACTION_ITEMS_INSTRUCTIONS = (
+    "End with a line reading 'Action Items:' followed by one line per action item "
+    "in exactly this format: '- [ ] <task> (owner: <name>, due: <YYYY-MM-DD>)'. "
+    "Use '- [x]' for items that are already done. "
+    "Leave out owner or due when they are not known. "
+    "Do not use Markdown headings anywhere in the response."
+)
+
+# Output tokens allowed for the summary of one note.
+SUMMARY_MAX_TOKENS = 2000
+
+SUMMARY_INSTRUCTIONS = (
+    "Please provide a concise summary and list of action items."
+    "Provide any additional context or insights as needed."
+    "Record decisions made, who made them, and the rationale behind them."
+    "Note agreed-upon follow-up meetings or checkpoints."
+    "Describe the client's expressed needs, challenges, and goals."
+    "Detail potential solutions discussed to address action items."
+    "Outline next steps for the meeting, including any documents or information to be exchanged."
+    f"\n\n{ACTION_ITEMS_INSTRUCTIONS}"
+)
 
 
 def sanitize_title(title):
@@ -29,7 +78,8 @@ def create_note(title, tags, notes_dir):
     filepath = os.path.join(notes_dir, filename)
 
     if tags:
-        tags_list = ", ".join([f'"{tag}"' for tag in tags])
+        tags = [normalize_tag(tag) for tag in tags]
+        tags_list = ", ".join([f'"{tag}"' for tag in tags if tag])
     else:
         tags_list = ""
 
@@ -41,17 +91,9 @@ def create_note(title, tags, notes_dir):
         f"---\n\n"
     )
 
-    template = front_matter + (
-        "# Raw Notes\n"
-        "- Start your note here.\n\n"
-        "# Processing\n"
-        "*Add clarifications or additional context here.*\n\n"
-        "# Connecting\n"
-        "*Link related notes or external resources here.*\n\n"
-        "# Summary\n"
-        "*LLM-generated summary will appear here.*\n\n"
-        "# Reflection\n"
-        "*Your personal reflections here.*\n"
+    template = front_matter + "\n".join(
+        f"# {section_title}\n{placeholder}\n"
+        for section_title, placeholder in NOTE_SECTIONS
     )
 
     with open(filepath, "w") as f:
@@ -67,43 +109,112 @@ def get_note_file(note_input, notes_dir) -> str:
     if note_input.isdigit():
         index = int(note_input) - 1
         files = get_note_files(notes_dir)
-        if index < 0 or index > len(files):
+        if index < 0 or index >= len(files):
             print("Invalid note index.")
             return ""
 
-        note_input = files[index - 1]
         note_file = os.path.join(notes_dir, files[index])
     else:
         note_file = note_input
         if not os.path.isabs(note_input):
-            note_input = os.path.join(notes_dir, note_input)
+            note_file = os.path.join(notes_dir, note_input)
+        if not os.path.exists(note_file) and not is_archived(
+            notes_dir, os.path.basename(note_file)
+        ):
+            # A missing filename is an error rather than a title search, so
+            # commands that write never act on a different note by accident.
+            if note_input.endswith(".md") or os.sep in note_input or "/" in note_input:
+                print(f"Note file not found: {note_input}")
+                return ""
+            filename = find_note_by_title(note_input, notes_dir)
+            if filename is None:
+                return ""
+            note_file = os.path.join(notes_dir, filename)
 
     return note_file
 
 
+def find_note_by_title(query, notes_dir):
+    """
+    Resolves a fuzzy title query to a note filename using the trigram title index.
+    Asks the user to pick when several notes match about equally well.
+    Returns None if no note matches.
+    """
+    title_index = update_title_index(notes_dir, load_notes_metadata(notes_dir))
+    matches = search_titles(title_index, query)
+    if not matches:
+        print(f"No note matches: {query}")
+        return None
+    if is_ambiguous(matches):
+        return pick_note(matches)
+    return matches[0][1]
+
+
+def read_note(note_file):
+    """
+    Reads a note from the notes directory, or from the archive if it has been archived.
+    Returns None if the note does not exist in either place.
+    """
+    if os.path.exists(note_file):
+        with open(note_file, "r", encoding="utf-8") as f:
+            return f.read()
+    notes_dir, filename = os.path.split(note_file)
+    return read_archived_note(notes_dir, filename)
+
+
 def open_note(note_input, notes_dir, editor):
     """
     Open or views a note.
     """
     note_file = get_note_file(note_input, notes_dir)
-
-    if not os.path.exists(note_file):
-        print(f"Note file not found: {note_input}")
+    if not note_file:
         return
 
     if editor is None:
         try:
-            with open(note_file, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = read_note(note_file)
         except Exception as e:
             print(f"Error reading note file: {e}")
             return
+        if content is None:
+            print(f"Note file not found: {note_input}")
+            return
 
-        console = Console()
-        markdown = Markdown(content)
-        console.print(markdown)
-    else:
+        print_markdown(content)
+    elif os.path.exists(note_file):
         subprocess.run([editor, note_file])
+    elif is_archived(notes_dir, os.path.basename(note_file)):
+        print(
+            f"Note is archived: {note_input}. Use the 'unarchive' command to edit it."
+        )
+    else:
+        print(f"Note file not found: {note_input}")
+
+
+def prefetch_renders(notes_dir, count):
+    """
+    Warms the render cache for the most recently modified notes in a background
+    thread, so viewing them later skips Markdown rendering. Returns the thread.
+    """
+    console = Console()
+    width, color_system = console.width, console.color_system
+    notes_metadata = load_notes_metadata(notes_dir)
+    recent = sorted(
+        notes_metadata, key=lambda filename: notes_metadata[filename]["mtime"]
+    )[-count:]
+
+    def warm():
+        for filename in reversed(recent):
+            try:
+                content = read_note(os.path.join(notes_dir, filename))
+                if content is not None:
+                    get_rendered(content, width, DEFAULT_CODE_THEME, color_system)
+            except Exception as e:
+                print(f"Error prefetching {filename}: {e}")
+
+    thread = threading.Thread(target=warm)
+    thread.start()
+    return thread
 
 
 def list_notes(notes_dir, filtered_notes=None):
@@ -117,20 +228,281 @@ def list_notes(notes_dir, filtered_notes=None):
     else:
         print("Notes in repository:")
         for index, file in enumerate(files, start=1):
-            if filtered_notes is not None and file in filtered_notes:
+            if filtered_notes is not None and file not in filtered_notes:
                 continue
             print(f"{index} {file}")
 
 
 def get_note_files(notes_dir) -> list:
     """
-    Indexes all Markdown files in the specified notes directory.
+    Indexes all Markdown files in the specified notes directory, including archived notes.
     """
     if not os.path.exists(notes_dir):
         print("No notes directory found.")
         return []
-    files = sorted([f for f in os.listdir(notes_dir) if f.endswith(".md")])
-    return files
+    files = {f for f in os.listdir(notes_dir) if f.endswith(".md")}
+    files.update(list_archived_notes(notes_dir))
+    return sorted(files)
+
+
+def load_notes_metadata(notes_dir) -> dict:
+    """
+    Returns a mapping of filenames to metadata for all notes, including archived notes.
+    Archived notes carry their metadata in the archive table, so the pack is not read.
+    """
+    if not os.path.exists(notes_dir):
+        return {}
+    notes = dict(list_archived_notes(notes_dir))
+    notes.update(refresh_index(notes_dir)["notes"])
+    return notes
+
+
+CATALOG_MAGIC = b"NNCATLG1"
+CATALOG_HEADER = struct.Struct("<8sQQ")
+# Column name and array typecode. Strings are stored as one UTF-8 blob per
+# column with an offsets column marking where each string starts and ends.
+CATALOG_COLUMNS = [
+    ("path_offsets", "Q"),
+    ("path_data", "B"),
+    ("title_offsets", "Q"),
+    ("title_data", "B"),
+    ("dates", "q"),
+    ("tag_offsets", "Q"),
+    ("tag_ids", "I"),
+    ("tag_name_offsets", "Q"),
+    ("tag_name_data", "B"),
+]
+CATALOG_SECTIONS = struct.Struct("<" + "QQ" * len(CATALOG_COLUMNS))
+# Tag patterns matching more tags than this are resolved in one pass over the
+# tag ID column instead of one lookup per tag.
+CATALOG_LOOKUP_TAGS = 8
+
+
+class NoteCatalog:
+    """
+    Compact in-memory catalog of note paths, titles, dates and tags.
+
+    Every field is stored in an array-backed column instead of a dict per note.
+    Tags are interned into integer IDs, and the tags of note i are the IDs in
+    tag_ids[tag_offsets[i]:tag_offsets[i + 1]]. Dates are stored as
+    YYYYMMDDHHMMSS integers, or -1 when unknown. A saved catalog is loaded with
+    mmap and its columns are memoryviews over the file, so nothing is copied or
+    parsed until a value is read. Catalog files use the native byte order and
+    are meant to be rebuilt, not shared between machines.
+    """
+
+    def __init__(self, columns, mapped=None):
+        self.columns = columns
+        self.mapped = mapped
+        self._tag_lookup = None
+        self._tag_trie = None
+
+    @classmethod
+    def from_metadata(cls, notes_metadata):
+        """
+        Builds a catalog from a mapping of filenames to note metadata, in
+        filename order.
+        """
+        columns = {name: array.array(code) for name, code in CATALOG_COLUMNS}
+        for name in (
+            "path_offsets",
+            "title_offsets",
+            "tag_offsets",
+            "tag_name_offsets",
+        ):
+            columns[name].append(0)
+
+        tag_lookup = {}
+        for filename in sorted(notes_metadata):
+            entry = notes_metadata[filename]
+            append_string(columns, "path", filename)
+            append_string(columns, "title", entry.get("title") or "")
+            columns["dates"].append(encode_catalog_date(entry.get("date")))
+            for tag in dict.fromkeys(entry["tags"]):
+                if tag not in tag_lookup:
+                    tag_lookup[tag] = len(tag_lookup)
+                    append_string(columns, "tag_name", tag)
+                columns["tag_ids"].append(tag_lookup[tag])
+            columns["tag_offsets"].append(len(columns["tag_ids"]))
+
+        catalog = cls(columns)
+        catalog._tag_lookup = tag_lookup
+        return catalog
+
+    @classmethod
+    def load(cls, path):
+        """
+        Maps a saved catalog into memory without reading its columns.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, _ = CATALOG_HEADER.unpack_from(mapped, 0)
+        if magic != CATALOG_MAGIC:
+            mapped.close()
+            raise ValueError(f"Not a note catalog: {path}")
+        sections = CATALOG_SECTIONS.unpack_from(mapped, CATALOG_HEADER.size)
+        view = memoryview(mapped)
+        columns = {}
+        for position, (name, code) in enumerate(CATALOG_COLUMNS):
+            offset, length = sections[2 * position], sections[2 * position + 1]
+            columns[name] = view[offset : offset + length].cast(code)
+        return cls(columns, mapped)
+
+    def save(self, path):
+        """
+        Atomically writes the catalog. Each column starts on an 8 byte boundary
+        so it can be cast in place after loading.
+        """
+        header_size = CATALOG_HEADER.size + CATALOG_SECTIONS.size
+        sections = []
+        chunks = []
+        offset = header_size
+        for name, _ in CATALOG_COLUMNS:
+            data = bytes(self.columns[name])
+            padding = b"\0" * (-len(data) % 8)
+            sections += [offset, len(data)]
+            chunks += [data, padding]
+            offset += len(data) + len(padding)
+        header = CATALOG_HEADER.pack(CATALOG_MAGIC, len(self), self.tag_count())
+        atomic_write(path, header + CATALOG_SECTIONS.pack(*sections) + b"".join(chunks))
+
+    def close(self):
+        """
+        Releases the memory map of a loaded catalog. Values read from the
+        catalog are copies, so they stay usable afterwards.
+        """
+        if self.mapped is None:
+            return
+        for column in self.columns.values():
+            column.release()
+        self.mapped.close()
+        self.mapped = None
+
+    def __len__(self):
+        return len(self.columns["path_offsets"]) - 1
+
+    def tag_count(self):
+        return len(self.columns["tag_name_offsets"]) - 1
+
+    def path(self, i):
+        return read_string(self.columns, "path", i)
+
+    def title(self, i):
+        return read_string(self.columns, "title", i)
+
+    def date(self, i):
+        value = self.columns["dates"][i]
+        if value < 0:
+            return None
+        return parse_note_date(str(value))
+
+    def tag_ids(self, i):
+        """
+        Returns the tag IDs of note i as a list. A list is returned rather than
+        a view of the column so that close() never finds the map still in use.
+        """
+        tag_offsets = self.columns["tag_offsets"]
+        return self.columns["tag_ids"][tag_offsets[i] : tag_offsets[i + 1]].tolist()
+
+    def tags(self, i):
+        return [
+            read_string(self.columns, "tag_name", tag_id) for tag_id in self.tag_ids(i)
+        ]
+
+    def tag_id(self, tag):
+        """
+        Returns the interned ID of a tag, or None if no note uses it.
+        """
+        if self._tag_lookup is None:
+            self._tag_lookup = {
+                read_string(self.columns, "tag_name", tag_id): tag_id
+                for tag_id in range(self.tag_count())
+            }
+        return self._tag_lookup.get(tag)
+
+    def notes_with_tag(self, tag) -> list:
+        """
+        Returns the positions of the notes that have a tag.
+        The tag ID column is searched as raw bytes, so only matches cost Python work.
+        """
+        tag_id = self.tag_id(tag)
+        if tag_id is None:
+            return []
+        return self._notes_with_tag_id(tag_id)
+
+    def notes_matching(self, pattern) -> set:
+        """
+        Returns the positions of the notes with a tag matching a pattern, with
+        wildcards as in TagTrie.match. The pattern is resolved over a trie of
+        the distinct tags, then each matching tag is looked up in the tag ID
+        column.
+        """
+        if self._tag_trie is None:
+            self._tag_trie = TagTrie()
+            for tag_id in range(self.tag_count()):
+                tag = read_string(self.columns, "tag_name", tag_id)
+                self._tag_trie.insert(tag, tag_id)
+        tag_ids = self._tag_trie.match(pattern)
+        if len(tag_ids) <= CATALOG_LOOKUP_TAGS:
+            positions = set()
+            for tag_id in tag_ids:
+                positions.update(self._notes_with_tag_id(tag_id))
+            return positions
+        # Counting the matching tags before each note in one pass over the
+        # tag ID column beats a lookup per tag when many tags match.
+        wanted = bytearray(self.tag_count())
+        for tag_id in tag_ids:
+            wanted[tag_id] = 1
+        counts = [0]
+        counts += itertools.accumulate(
+            wanted[tag_id] for tag_id in self.columns["tag_ids"]
+        )
+        tag_offsets = self.columns["tag_offsets"]
+        return {
+            i
+            for i in range(len(self))
+            if counts[tag_offsets[i + 1]] > counts[tag_offsets[i]]
+        }
+
+    def _notes_with_tag_id(self, tag_id):
+        tag_offsets = self.columns["tag_offsets"]
+        raw_ids = self.columns["tag_ids"].tobytes()
+        pattern = array.array("I", [tag_id]).tobytes()
+        positions = []
+        note = 0
+        start = 0
+        while True:
+            found = raw_ids.find(pattern, start)
+            if found < 0:
+                break
+            if found % len(pattern):
+                start = found + 1
+                continue
+            note = bisect.bisect_right(tag_offsets, found // len(pattern), note) - 1
+            positions.append(note)
+            start = tag_offsets[note + 1] * len(pattern)
+        return positions
+
+
+def encode_catalog_date(date_str):
+    """
+    Encodes a front matter date as a YYYYMMDDHHMMSS integer, or -1 if unknown.
+    Dates already in the create_note format skip strptime.
+    """
+    if date_str and len(date_str) == 14 and date_str.isdigit():
+        return int(date_str)
+    note_date = parse_note_date(date_str)
+    return int(note_date.strftime("%Y%m%d%H%M%S")) if note_date else -1
+
+
+def append_string(columns, name, value):
+    columns[f"{name}_data"].frombytes(value.encode("utf-8"))
+    columns[f"{name}_offsets"].append(len(columns[f"{name}_data"]))
+
+
+def read_string(columns, name, i):
+    offsets = columns[f"{name}_offsets"]
+    return bytes(columns[f"{name}_data"][offsets[i] : offsets[i + 1]]).decode("utf-8")
 
 
 def print_tags(tags):
@@ -147,62 +519,208 @@ def print_tags(tags):
 
 def list_all_tags(notes_dir) -> list:
     """
-    Iterates through all Markdown files and collects unique tags from the YAML front matter.
+    Collects unique tags from the YAML front matter of all notes using the metadata index.
     Returns a sorted list of tags.
     """
     tags = set()
     if not os.path.exists(notes_dir):
         print("Notes directory not found.")
         return []
-    for filename in os.listdir(notes_dir):
-        if filename.endswith(".md"):
-            filepath = os.path.join(notes_dir, filename)
-            try:
-                post = frontmatter.load(filepath)
-                note_tags = post.get("tags", [])
-                if note_tags is None:
-                    note_tags = []
-                if isinstance(note_tags, list):
-                    for tag in note_tags:
-                        if isinstance(tag, str):
-                            tags.add(tag)
-                        else:
-                            tags.add(str(tag))
-                elif isinstance(note_tags, str):
-                    for tag in note_tags.split(","):
-                        tag = tag.strip().strip('"')
-                        if tag:
-                            tags.add(tag)
-            except Exception as e:
-                print(f"Error reading {filepath}: {e}")
+    for entry in load_notes_metadata(notes_dir).values():
+        tags.update(entry["tags"])
     return sorted(tags)
 
 
 def filter_notes_by_tags(notes_dir, required_tags):
     """
-    Returns a list of note filenames that contain all of the required_tags.
+    Returns a list of note filenames that match all of the required_tags.
+    A required tag may be a hierarchical wildcard such as client/acme/*, which
+    matches client/acme and every tag below it.
+    Tags are matched against a NoteCatalog of the notes, so each distinct tag is
+    resolved once rather than once per note.
     """
     matching_notes = []
     if not os.path.exists(notes_dir):
         print("Notes directory not found.")
         return matching_notes
-    for filename in os.listdir(notes_dir):
-        if filename.endswith(".md"):
-            filepath = os.path.join(notes_dir, filename)
+    catalog = NoteCatalog.from_metadata(load_notes_metadata(notes_dir))
+    if not required_tags:
+        return [catalog.path(i) for i in range(len(catalog))]
+    matches = [catalog.notes_matching(normalize_tag(tag)) for tag in required_tags]
+    # The catalog is in filename order, so sorted positions give sorted names.
+    return [catalog.path(i) for i in sorted(set.intersection(*matches))]
+
+
+def retag(note_tags, renames=None, add=None, remove=None):
+    """
+    Applies renames, removals and additions to a list of tags.
+    A rename moves the whole subtree of a hierarchical tag, so renaming client/acme
+    also turns client/acme/infra into the new parent; the most specific rename wins.
+    Removals match exact tags only.
+    Duplicate tags produced by a merge are collapsed, keeping the first occurrence.
+    """
+    renames = renames or {}
+    remove = set(remove or [])
+    new_tags = []
+    for tag in note_tags:
+        tag = rename_tag(tag, renames)
+        if tag not in remove and tag not in new_tags:
+            new_tags.append(tag)
+    for tag in add or []:
+        if tag not in remove and tag not in new_tags:
+            new_tags.append(tag)
+    return new_tags
+
+
+def rename_tag(tag, renames):
+    """
+    Returns tag with the longest renamed prefix replaced, or tag itself.
+    """
+    parts = tag.split(TAG_SEPARATOR)
+    for depth in range(len(parts), 0, -1):
+        prefix = TAG_SEPARATOR.join(parts[:depth])
+        if prefix in renames:
+            return TAG_SEPARATOR.join([renames[prefix], *parts[depth:]])
+    return tag
+
+
+def replace_front_matter_tags(front_matter, tags):
+    """
+    Replaces the tags entry of a front matter block, leaving every other line untouched.
+    """
+    tags_line = "tags: [" + ", ".join(json.dumps(tag) for tag in tags) + "]\n"
+    lines = front_matter.splitlines(keepends=True)
+    new_lines = []
+    replaced = False
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        if not replaced and re.match(r"^tags\s*:", line):
+            new_lines.append(tags_line)
+            replaced = True
+            # Skip a block style list or a flow list continued on indented lines.
+            while i < len(lines) and lines[i].startswith((" ", "\t", "-")):
+                i += 1
+            continue
+        new_lines.append(line)
+    if not replaced:
+        new_lines.append(tags_line)
+    return "".join(new_lines)
+
+
+def rewrite_note_tags(filepath, tags):
+    """
+    Rewrites the front matter of a note with a new tags list.
+    The body is streamed through unchanged and the file is replaced atomically.
+    """
+    front_matter, body_offset = read_front_matter(filepath)
+    header = "---\n" + replace_front_matter_tags(front_matter, tags) + "---\n"
+    if body_offset == 0:
+        header += "\n"
+
+    directory = os.path.dirname(filepath)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as out, open(filepath, "rb") as src:
+            out.write(header.encode("utf-8"))
+            src.seek(body_offset)
+            shutil.copyfileobj(src, out)
+        shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def retag_notes(notes_dir, renames=None, add=None, remove=None, required_tags=None):
+    """
+    Renames, merges, adds or removes tags across the notes directory.
+    required_tags selects notes the way filter_notes_by_tags does, so wildcards
+    such as client/* work.
+    Only the front matter of affected notes is rewritten, notes are processed in
+    parallel and the metadata index is updated for the rewritten notes only.
+    Archived notes are retagged in the archive.
+    Returns a sorted list of the filenames that were changed.
+    """
+    if not os.path.exists(notes_dir):
+        print("Notes directory not found.")
+        return []
+
+    # Tags are normalized the way create_note stores them.
+    renames = {
+        normalize_tag(old): normalize_tag(new)
+        for old, new in (renames or {}).items()
+        if normalize_tag(old) and normalize_tag(new)
+    }
+    add = [tag for tag in map(normalize_tag, add or []) if tag]
+    remove = [tag for tag in map(normalize_tag, remove or []) if tag]
+    selected = None
+    if required_tags:
+        selected = set(filter_notes_by_tags(notes_dir, required_tags))
+
+    index = refresh_index(notes_dir)
+    changes = {}
+    for filename, entry in index["notes"].items():
+        if selected is not None and filename not in selected:
+            continue
+        new_tags = retag(entry["tags"], renames, add, remove)
+        if new_tags != entry["tags"]:
+            changes[filename] = new_tags
+
+    archived_changes = {}
+    for filename, entry in list_archived_notes(notes_dir).items():
+        note_tags = entry.get("tags", [])
+        if filename in index["notes"]:
+            continue
+        if selected is not None and filename not in selected:
+            continue
+        new_tags = retag(note_tags, renames, add, remove)
+        if new_tags != note_tags:
+            archived_changes[filename] = new_tags
+
+    def rewrite(filename):
+        rewrite_note_tags(os.path.join(notes_dir, filename), changes[filename])
+        return filename
+
+    changed = []
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(rewrite, filename) for filename in changes]
+        for future in as_completed(futures):
             try:
-                post = frontmatter.load(filepath)
-                note_tags = post.get("tags", [])
-                if note_tags is None:
-                    note_tags = []
-                if isinstance(note_tags, str):
-                    note_tags = [
-                        t.strip().strip('"') for t in note_tags.split(",") if t.strip()
-                    ]
-                if all(tag in note_tags for tag in required_tags):
-                    matching_notes.append(filename)
+                filename = future.result()
             except Exception as e:
-                print(f"Error reading {filepath}: {e}")
-    return sorted(matching_notes)
+                print(f"Error retagging note: {e}")
+                continue
+            metadata = dict(index["notes"][filename], tags=changes[filename])
+            set_index_entry(index, notes_dir, filename, metadata)
+            changed.append(filename)
+
+    if changed:
+        save_index(notes_dir, index)
+    if archived_changes:
+        changed += retag_archived_notes(notes_dir, archived_changes)
+    return sorted(changed)
+
+
+def retag_archived_notes(notes_dir, changes):
+    """
+    Rewrites the tags of archived notes in the archive. changes maps filenames
+    to their new tags. Returns a sorted list of the filenames that were changed.
+    """
+    contents = {}
+    for filename, tags in changes.items():
+        content = read_archived_note(notes_dir, filename)
+        front_matter, body = split_front_matter(content)
+        if body == content:
+            # Like rewrite_note_tags, a note without front matter gets one.
+            body = "\n" + content
+        contents[filename] = (
+            "---\n" + replace_front_matter_tags(front_matter, tags) + "---\n" + body
+        )
+    metadata = {filename: {"tags": tags} for filename, tags in changes.items()}
+    return rewrite_archived_notes(notes_dir, contents, metadata)
 
 
 def extract_section(content, section_title):
@@ -221,15 +739,47 @@ def update_section(content, section_title, new_text):
     Updates the specified section with new_text and returns the updated content.
     """
     pattern = rf"(^#\s*{re.escape(section_title)}\s*\n)(.*?)(?=\n#|\Z)"
-    replacement = rf"\1{new_text}\n"
     new_content, count = re.subn(
-        pattern, replacement, content, flags=re.DOTALL | re.MULTILINE
+        pattern,
+        lambda match: f"{match.group(1)}{new_text}\n",
+        content,
+        flags=re.DOTALL | re.MULTILINE,
     )
     if count == 0:
         new_content = content + f"\n# {section_title}\n{new_text}\n"
     return new_content
 
 
+def format_note_sections(content):
+    """
+    Returns the Raw Notes, Processing and Connecting sections of a note formatted
+    for a summarization prompt.
+    """
+    raw_notes = extract_section(content, "Raw Notes")
+    processing = extract_section(content, "Processing")
+    connecting = extract_section(content, "Connecting")
+    return (
+        f"Raw Notes:\n{raw_notes}\n\n"
+        f"Processing:\n{processing}\n\n"
+        f"Connecting:\n{connecting}\n\n"
+    )
+
+
+def write_summary(note_file, content, summary_text):
+    """
+    Places summary_text in the Summary section of a note.
+    Returns False if the note could not be written.
+    """
+    new_content = update_section(content, "Summary", summary_text)
+    try:
+        with open(note_file, "w", encoding="utf-8") as f:
+            f.write(new_content)
+    except Exception as e:
+        print(f"Error writing updated note file: {e}")
+        return False
+    return True
+
+
 def summarize_note_file(note_file, openai_token):
     """
     Uses OpenAI's API to summarize the note based on its Raw Notes, Processing, and Connecting sections.
@@ -242,38 +792,22 @@ def summarize_note_file(note_file, openai_token):
         print(f"Error reading note file: {e}")
         return None
 
-    raw_notes = extract_section(content, "Raw Notes")
-    processing = extract_section(content, "Processing")
-    connecting = extract_section(content, "Connecting")
-
     prompt = (
         "Summarize the following sections and outline any action items mentioned:\n\n"
-        f"Raw Notes:\n{raw_notes}\n\n"
-        f"Processing:\n{processing}\n\n"
-        f"Connecting:\n{connecting}\n\n"
-        "Please provide a concise summary and list of action items."
-        "Provide any additional context or insights as needed."
-        "Record decisions made, who made them, and the rationale behind them."
-        "Note agreed-upon follow-up meetings or checkpoints."
-        "Describe the client's expressed needs, challenges, and goals."
-        "Detail potential solutions discussed to address action items."
-        "Outline next steps for the meeting, including any documents or information to be exchanged."
+        f"{format_note_sections(content)}"
+        f"{SUMMARY_INSTRUCTIONS}"
     )
 
     summary_text = get_openai_response(prompt, openai_token)
-    new_content = update_section(content, "Summary", summary_text)
-
-    try:
-        with open(note_file, "w", encoding="utf-8") as f:
-            f.write(new_content)
-    except Exception as e:
-        print(f"Error writing updated note file: {e}")
+    if summary_text is None:
+        return None
+    if not write_summary(note_file, content, summary_text):
         return None
 
     return summary_text
 
 
-def get_openai_response(prompt, openai_token):
+def get_openai_response(prompt, openai_token, max_tokens=SUMMARY_MAX_TOKENS):
     """
     Uses OpenAI's API to get a response based on the provided prompt.
     """
@@ -288,7 +822,7 @@ def get_openai_response(prompt, openai_token):
                 },
                 {"role": "user", "content": prompt},
             ],
-            max_tokens=2000,
+            max_tokens=max_tokens,
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -0,0 +1,162 @@
+import json
+import re
+
+from note import (SUMMARY_INSTRUCTIONS, SUMMARY_MAX_TOKENS,
+                  format_note_sections, get_openai_response,
+                  summarize_note_file, write_summary)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_TOKEN_BUDGET = 3000
+# Output tokens the model can return in one response. Each note in a packed
+# request gets as many output tokens as a request of its own, which limits how
+# many notes fit in one request.
+MAX_OUTPUT_TOKENS = 16000
+MAX_NOTES_PER_REQUEST = MAX_OUTPUT_TOKENS // SUMMARY_MAX_TOKENS
+TOKENIZER_MODEL = "gpt-4o-mini"
+SUMMARY_PAIR_PATTERN = re.compile(r'"(\d+)"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+_encoding = None
+
+
+def count_tokens(text):
+    """
+    Counts the tokens of text locally. Uses tiktoken when it is installed and
+    otherwise estimates from words and punctuation, which is close enough for
+    packing decisions.
+    """
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            _encoding = tiktoken.encoding_for_model(TOKENIZER_MODEL)
+        return len(_encoding.encode(text))
+    return len(re.findall(r"\w+|[^\w\s]", text)) * 4 // 3
+
+
+def pack_notes(note_tokens, token_budget=DEFAULT_TOKEN_BUDGET) -> list:
+    """
+    Groups notes into requests. note_tokens is a list of (note_file, tokens)
+    pairs in the order they should be summarized. Notes are added to the current
+    request until the next one would exceed the token budget or
+    MAX_NOTES_PER_REQUEST. A note larger than the budget gets a request of its own.
+    Returns a list of lists of note files.
+    """
+    fixed_tokens = count_tokens(build_packed_prompt([]))
+    packs = []
+    current = []
+    current_tokens = fixed_tokens
+    for note_file, tokens in note_tokens:
+        if current and (
+            current_tokens + tokens > token_budget
+            or len(current) >= MAX_NOTES_PER_REQUEST
+        ):
+            packs.append(current)
+            current = []
+            current_tokens = fixed_tokens
+        current.append(note_file)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_packed_prompt(sections) -> str:
+    """
+    Builds one prompt for several notes. The fixed instructions are sent once,
+    followed by each note's sections under a numbered header.
+    """
+    prompt = (
+        "Summarize each of the following notes separately and outline any action "
+        "items mentioned in it.\n\n"
+        f"{SUMMARY_INSTRUCTIONS}\n\n"
+        "Respond with a JSON object only, without code fences, that maps each "
+        'note number to the summary of that note, for example {"1": "...", "2": "..."}. '
+        "Each summary must follow the instructions above on its own.\n\n"
+    )
+    for number, note_sections in enumerate(sections, start=1):
+        prompt += f"=== Note {number} ===\n{note_sections}"
+    return prompt
+
+
+def parse_packed_response(response, count) -> dict:
+    """
+    Parses the JSON object returned for a packed request.
+    Returns a mapping of note position (starting at 0) to summary text, leaving
+    out notes whose summary is missing or empty. If the response was cut off,
+    the summaries completed before the cut are still returned. Returns an empty
+    dict if nothing can be parsed.
+    """
+    if not response:
+        return {}
+    text = response.strip()
+    fence = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fence:
+        text = fence.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = {
+            number: json.loads(value)
+            for number, value in SUMMARY_PAIR_PATTERN.findall(text)
+        }
+    if not isinstance(data, dict):
+        return {}
+    summaries = {}
+    for position in range(count):
+        summary = data.get(str(position + 1))
+        if isinstance(summary, str) and summary.strip():
+            summaries[position] = summary.strip()
+    return summaries
+
+
+def summarize_notes_packed(note_files, openai_token, token_budget=DEFAULT_TOKEN_BUDGET):
+    """
+    Summarizes several notes with as few requests as possible by packing small
+    notes into one request up to token_budget input tokens. Notes whose part of
+    a packed response is missing or unparseable are summarized individually.
+    Returns a mapping of note file to summary text, or None where it failed.
+    """
+    contents = {}
+    note_tokens = []
+    results = {}
+    for note_file in note_files:
+        try:
+            with open(note_file, "r", encoding="utf-8") as f:
+                contents[note_file] = f.read()
+        except Exception as e:
+            print(f"Error reading note file: {e}")
+            results[note_file] = None
+            continue
+        sections = format_note_sections(contents[note_file])
+        note_tokens.append((note_file, count_tokens(sections)))
+
+    requests = 0
+    for pack in pack_notes(note_tokens, token_budget):
+        if len(pack) == 1:
+            results[pack[0]] = summarize_note_file(pack[0], openai_token)
+            requests += 1
+            continue
+
+        sections = [format_note_sections(contents[note_file]) for note_file in pack]
+        response = get_openai_response(
+            build_packed_prompt(sections),
+            openai_token,
+            max_tokens=SUMMARY_MAX_TOKENS * len(pack),
+        )
+        requests += 1
+        summaries = parse_packed_response(response, len(pack))
+        for position, note_file in enumerate(pack):
+            summary = summaries.get(position)
+            if summary is None:
+                results[note_file] = summarize_note_file(note_file, openai_token)
+                requests += 1
+            elif write_summary(note_file, contents[note_file], summary):
+                results[note_file] = summary
+            else:
+                results[note_file] = None
+
+    print(f"Summarized {len(note_files)} note(s) in {requests} request(s).")
+    return results
@@ -0,0 +1,293 @@
+import datetime
+import os
+import re
+
+from index import parse_note_date
+from note import extract_section, load_notes_metadata, read_note
+from tags import build_tag_trie, normalize_tag
+
+SECTION_FIELDS = {
+    "raw": "Raw Notes",
+    "processing": "Processing",
+    "connecting": "Connecting",
+    "summary": "Summary",
+    "reflection": "Reflection",
+}
+INDEX_FIELDS = ("tag", "date", "title")
+TEXT_FIELDS = ("text",) + tuple(SECTION_FIELDS)
+KEYWORDS = ("AND", "OR", "NOT")
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+      | (?P<predicate>(?P<field>\w+)(?P<op>>=|<=|:|=|>|<)
+            (?:"(?P<quoted>[^"]*)"|(?P<bare>[^\s()]+)))
+      | (?P<word>[^\s()]+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+def tokenize(query):
+    """
+    Splits a query into parentheses, keywords and field predicates.
+    """
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unexpected input at: {query[position:]}")
+        position = match.end()
+        if match.group("paren"):
+            tokens.append(("paren", match.group("paren")))
+        elif match.group("predicate"):
+            value = match.group("quoted")
+            if value is None:
+                value = match.group("bare")
+            tokens.append(
+                ("predicate", (match.group("field").lower(), match.group("op"), value))
+            )
+        elif match.group("word").upper() in KEYWORDS:
+            tokens.append(("keyword", match.group("word").upper()))
+        else:
+            raise ValueError(
+                f"Expected a predicate such as tag:name, got: {match.group('word')}"
+            )
+    return tokens
+
+
+def parse_query(query):
+    """
+    Parses a query into a tree of ("and", [...]), ("or", [...]), ("not", node)
+    and ("predicate", field, op, value) nodes.
+    Terms next to each other are combined with AND, so
+    tag:acme text:"rollback" NOT tag:draft is read as
+    tag:acme AND text:"rollback" AND NOT tag:draft.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        raise ValueError("Empty query.")
+    node, position = parse_or(tokens, 0)
+    if position != len(tokens):
+        raise ValueError(f"Unexpected token: {tokens[position][1]}")
+    return node
+
+
+def parse_or(tokens, position):
+    node, position = parse_and(tokens, position)
+    children = [node]
+    while position < len(tokens) and tokens[position] == ("keyword", "OR"):
+        node, position = parse_and(tokens, position + 1)
+        children.append(node)
+    if len(children) == 1:
+        return children[0], position
+    return ("or", children), position
+
+
+def parse_and(tokens, position):
+    node, position = parse_not(tokens, position)
+    children = [node]
+    while position < len(tokens):
+        token = tokens[position]
+        if token == ("keyword", "AND"):
+            position += 1
+        elif token == ("keyword", "OR") or token == ("paren", ")"):
+            break
+        node, position = parse_not(tokens, position)
+        children.append(node)
+    if len(children) == 1:
+        return children[0], position
+    return ("and", children), position
+
+
+def parse_not(tokens, position):
+    if position >= len(tokens):
+        raise ValueError("Query ends unexpectedly.")
+    token = tokens[position]
+    if token == ("keyword", "NOT"):
+        node, position = parse_not(tokens, position + 1)
+        return ("not", node), position
+    if token == ("paren", "("):
+        node, position = parse_or(tokens, position + 1)
+        if position >= len(tokens) or tokens[position] != ("paren", ")"):
+            raise ValueError("Missing closing parenthesis.")
+        return node, position + 1
+    if token[0] == "predicate":
+        field, op, value = token[1]
+        validate_predicate(field, op, value)
+        return ("predicate", field, op, value), position + 1
+    raise ValueError(f"Unexpected token: {token[1]}")
+
+
+def validate_predicate(field, op, value):
+    if field not in INDEX_FIELDS + TEXT_FIELDS:
+        raise ValueError(f"Unknown field: {field}")
+    if field == "date":
+        parse_date_range(value)
+    elif op != ":":
+        raise ValueError(f"Only date supports comparisons, got {field}{op}")
+
+
+def parse_date_range(value):
+    """
+    Parses YYYY, YYYY-MM or YYYY-MM-DD into the half-open range of datetimes it covers.
+    """
+    for fmt, unit in (("%Y-%m-%d", "day"), ("%Y-%m", "month"), ("%Y", "year")):
+        try:
+            start = datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if unit == "day":
+            end = start + datetime.timedelta(days=1)
+        elif unit == "month":
+            end = (start + datetime.timedelta(days=32)).replace(day=1)
+        else:
+            end = start.replace(year=start.year + 1)
+        return start, end
+    raise ValueError(f"Invalid date: {value} (use YYYY, YYYY-MM or YYYY-MM-DD)")
+
+
+def date_matches(note_date, op, start, end):
+    if op == ">=":
+        return note_date >= start
+    if op == ">":
+        return note_date >= end
+    if op == "<=":
+        return note_date < end
+    if op == "<":
+        return note_date < start
+    return start <= note_date < end
+
+
+def uses_text(node):
+    """
+    Returns True if evaluating the node requires opening note files.
+    """
+    if node[0] == "predicate":
+        return node[1] in TEXT_FIELDS
+    if node[0] == "not":
+        return uses_text(node[1])
+    return any(uses_text(child) for child in node[1])
+
+
+class QueryPlanner:
+    """
+    Evaluates a parsed query against the notes directory.
+    Tag, date and title predicates are answered from the metadata index. Inside
+    an AND the predicates with the smallest index cardinality run first, and
+    predicates that need the note text run last, so note files are only opened
+    for the candidates that survive every index predicate.
+    """
+
+    def __init__(self, notes_dir):
+        self.notes_dir = notes_dir
+        self.notes = load_notes_metadata(notes_dir)
+        self.trie = build_tag_trie(self.notes)
+        self.dates = {
+            filename: parse_note_date(entry["date"])
+            for filename, entry in self.notes.items()
+        }
+        self.contents = {}
+        self.cardinalities = {}
+        self.notes_read = 0
+
+    def run(self, node) -> list:
+        return sorted(self.evaluate(node, set(self.notes)))
+
+    def cardinality(self, node):
+        """
+        Estimates how many notes a node matches. Index predicates are counted
+        exactly and cached; text predicates are assumed to match every note.
+        """
+        kind = node[0]
+        if kind == "predicate":
+            if node[1] in TEXT_FIELDS:
+                return len(self.notes)
+            if node not in self.cardinalities:
+                self.cardinalities[node] = len(
+                    self.evaluate_index_predicate(node, set(self.notes))
+                )
+            return self.cardinalities[node]
+        if kind == "not":
+            return len(self.notes) - self.cardinality(node[1])
+        if kind == "and":
+            return min(self.cardinality(child) for child in node[1])
+        return min(len(self.notes), sum(self.cardinality(c) for c in node[1]))
+
+    def evaluate(self, node, candidates) -> set:
+        kind = node[0]
+        if kind == "predicate":
+            if node[1] in TEXT_FIELDS:
+                return self.evaluate_text_predicate(node, candidates)
+            return self.evaluate_index_predicate(node, candidates)
+        if kind == "not":
+            return candidates - self.evaluate(node[1], candidates)
+        if kind == "or":
+            matches = set()
+            for child in node[1]:
+                matches |= self.evaluate(child, candidates - matches)
+            return matches
+        plan = sorted(node[1], key=lambda c: (uses_text(c), self.cardinality(c)))
+        for child in plan:
+            candidates = self.evaluate(child, candidates)
+            if not candidates:
+                break
+        return candidates
+
+    def evaluate_index_predicate(self, node, candidates):
+        _, field, op, value = node
+        if field == "tag":
+            return candidates & self.trie.match(normalize_tag(value))
+        if field == "title":
+            value = value.lower()
+            return {
+                filename
+                for filename in candidates
+                if value in self.notes[filename]["title"].lower()
+            }
+        start, end = parse_date_range(value)
+        return {
+            filename
+            for filename in candidates
+            if self.dates[filename] is not None
+            and date_matches(self.dates[filename], op, start, end)
+        }
+
+    def evaluate_text_predicate(self, node, candidates):
+        _, field, _, value = node
+        value = value.lower()
+        matches = set()
+        for filename in candidates:
+            content = self.read_content(filename)
+            if field != "text":
+                content = extract_section(content, SECTION_FIELDS[field])
+            if value in content.lower():
+                matches.add(filename)
+        return matches
+
+    def read_content(self, filename):
+        if filename not in self.contents:
+            try:
+                content = read_note(os.path.join(self.notes_dir, filename))
+            except Exception as e:
+                print(f"Error reading {filename}: {e}")
+                content = None
+            self.contents[filename] = content or ""
+            self.notes_read += 1
+        return self.contents[filename]
+
+
+def query_notes(notes_dir, query) -> list:
+    """
+    Returns the sorted filenames of the notes matching a query.
+    Raises ValueError if the query cannot be parsed.
+    """
+    node = parse_query(query)
+    if not os.path.exists(notes_dir):
+        print("Notes directory not found.")
+        return []
+    return QueryPlanner(notes_dir).run(node)
@@ -0,0 +1,109 @@
+import hashlib
+import io
+import os
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+import config
+from index import atomic_write
+
+CACHE_DIR_NAME = "render_cache"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_CODE_THEME = "monokai"
+
+
+def get_cache_dir():
+    return os.path.join(config.CONFIG_DIR, CACHE_DIR_NAME)
+
+
+def get_cache_key(content, width, theme, color_system):
+    """
+    Returns the cache key of a rendered note. Anything that changes the
+    rendered output is part of the key, so stale entries are never served.
+    """
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return f"{digest}-{width}-{theme}-{color_system}"
+
+
+def render_markdown(content, width, theme, color_system):
+    """
+    Renders Markdown to the ANSI text rich would print to a terminal.
+    """
+    buffer = io.StringIO()
+    console = Console(
+        file=buffer,
+        width=width,
+        color_system=color_system,
+        force_terminal=color_system is not None,
+    )
+    console.print(Markdown(content, code_theme=theme))
+    return buffer.getvalue()
+
+
+def evict(cache_dir, max_bytes):
+    """
+    Removes the least recently used entries until the cache fits in max_bytes.
+    Entries are touched on every hit, so mtime orders them by last use.
+    """
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as dir_entries:
+        for dir_entry in dir_entries:
+            if dir_entry.name.endswith(".ansi"):
+                stat = dir_entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def get_rendered(
+    content,
+    width,
+    theme=DEFAULT_CODE_THEME,
+    color_system=None,
+    max_bytes=MAX_CACHE_BYTES,
+):
+    """
+    Returns the rendered output of a note from the cache, rendering and storing
+    it on a miss. Returns a (rendered, hit) tuple.
+    """
+    cache_dir = get_cache_dir()
+    path = os.path.join(
+        cache_dir, get_cache_key(content, width, theme, color_system) + ".ansi"
+    )
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rendered = f.read()
+        os.utime(path)
+        return rendered, True
+    except FileNotFoundError:
+        pass
+
+    rendered = render_markdown(content, width, theme, color_system)
+    atomic_write(path, rendered.encode("utf-8"))
+    evict(cache_dir, max_bytes)
+    return rendered, False
+
+
+def print_markdown(content, theme=DEFAULT_CODE_THEME):
+    """
+    Prints a note with Markdown rendering, reusing the cached rendering when the
+    note, terminal width, theme and colour support are unchanged.
+    """
+    console = Console()
+    try:
+        rendered, _ = get_rendered(content, console.width, theme, console.color_system)
+    except OSError:
+        console.print(Markdown(content, code_theme=theme))
+        return
+    console.file.write(rendered)
+    console.file.flush()
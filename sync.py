@@ -1,10 +1,14 @@
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_PARALLEL_SYNCS = 4
 
 
 def create_gitignore(notes_dir):
     """
-    Create or update a .gitignore file in the notes directory to ignore settings.yaml.
+    Create or update a .gitignore file in the notes directory to ignore settings.yaml
+    and the locally built indexes.
     """
     gitignore_path = os.path.join(notes_dir, ".gitignore")
     if os.path.exists(gitignore_path):
@@ -12,41 +16,51 @@ def create_gitignore(notes_dir):
             lines = f.read().splitlines()
     else:
         lines = []
-    if "settings.yaml" not in lines:
-        lines.append("settings.yaml")
+    for entry in ["settings.yaml", ".index/"]:
+        if entry not in lines:
+            lines.append(entry)
     with open(gitignore_path, "w") as f:
         f.write("\n".join(lines) + "\n")
 
 
-def init_git_repo(notes_dir, remote_repo):
+def init_git_repo(notes_dir, remote_repo, quiet=False):
     """
     Initializes a git repository in the notes directory if not already present
     and sets the remote repository URL.
     """
+    log = (lambda message: None) if quiet else print
+    output = {"capture_output": True, "text": True} if quiet else {}
     git_dir = os.path.join(notes_dir, ".git")
     if not os.path.exists(git_dir):
-        print("Initializing git repository...")
-        subprocess.run(["git", "init"], cwd=notes_dir, check=True)
+        log("Initializing git repository...")
+        subprocess.run(["git", "init"], cwd=notes_dir, check=True, **output)
     remotes = subprocess.run(
         ["git", "remote"], cwd=notes_dir, capture_output=True, text=True
     )
     if "origin" not in remotes.stdout:
-        print(f"Setting remote repository to {remote_repo}...")
+        log(f"Setting remote repository to {remote_repo}...")
         subprocess.run(
-            ["git", "remote", "add", "origin", remote_repo], cwd=notes_dir, check=True
+            ["git", "remote", "add", "origin", remote_repo],
+            cwd=notes_dir,
+            check=True,
+            **output,
         )
 
 
-def sync_notes(notes_dir, remote_repo):
+def sync_notes(notes_dir, remote_repo, quiet=False):
     """
     Syncs the notes directory with the remote Git repository:
-    - Ensures .gitignore includes settings.yaml.
+    - Ensures .gitignore includes settings.yaml and the index directory.
     - Initializes the git repo and sets the remote if needed.
     - Pulls changes from the remote repository.
     - Adds, commits, and pushes all changes.
+    With quiet set, progress messages and git output are suppressed so several
+    notebooks can be synced at once. Returns True if changes were committed.
     """
+    log = (lambda message: None) if quiet else print
+    output = {"capture_output": True, "text": True} if quiet else {}
     create_gitignore(notes_dir)
-    init_git_repo(notes_dir, remote_repo)
+    init_git_repo(notes_dir, remote_repo, quiet)
 
     branch_proc = subprocess.run(
         ["git", "symbolic-ref", "--short", "HEAD"],
@@ -60,29 +74,69 @@ def sync_notes(notes_dir, remote_repo):
         branch_name = "main"
 
     # Pull remote changes first.
-    print("Pulling changes from remote repository...")
+    log("Pulling changes from remote repository...")
     try:
         subprocess.run(
             ["git", "pull", "--rebase", "origin", branch_name],
             cwd=notes_dir,
             check=True,
+            **output,
         )
     except subprocess.CalledProcessError as e:
-        print(f"No files pulled. {e}")
+        log(f"No files pulled. {e}")
 
-    print("Adding changes to git...")
-    subprocess.run(["git", "add", "."], cwd=notes_dir, check=True)
+    log("Adding changes to git...")
+    subprocess.run(["git", "add", "."], cwd=notes_dir, check=True, **output)
 
     # Check if there are changes to commit.
     commit_check = subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=notes_dir)
-    if commit_check.returncode != 0:
-        print("Committing changes...")
-        subprocess.run(["git", "commit", "-m", "Sync notes"], cwd=notes_dir, check=True)
+    committed = commit_check.returncode != 0
+    if committed:
+        log("Committing changes...")
+        subprocess.run(
+            ["git", "commit", "-m", "Sync notes"], cwd=notes_dir, check=True, **output
+        )
     else:
-        print("No changes to commit.")
+        log("No changes to commit.")
 
-    print("Pushing changes to remote repository...")
+    log("Pushing changes to remote repository...")
     subprocess.run(
-        ["git", "push", "-u", "origin", branch_name], cwd=notes_dir, check=True
+        ["git", "push", "-u", "origin", branch_name],
+        cwd=notes_dir,
+        check=True,
+        **output,
     )
-    print("Sync complete.")
+    log("Sync complete.")
+    return committed
+
+
+def sync_notebook(notes_dir, remote_repo):
+    """
+    Syncs one notebook quietly for sync_notebooks.
+    Returns a (succeeded, message) tuple.
+    """
+    try:
+        committed = sync_notes(notes_dir, remote_repo, quiet=True)
+    except subprocess.CalledProcessError as e:
+        detail = (e.stderr or "").strip().splitlines()
+        reason = detail[-1] if detail else f"exit status {e.returncode}"
+        return False, f"git {e.cmd[1]} failed: {reason}"
+    except OSError as e:
+        return False, str(e)
+    return True, "committed and pushed changes" if committed else "no changes to commit"
+
+
+def sync_notebooks(notebooks, max_workers=MAX_PARALLEL_SYNCS) -> dict:
+    """
+    Syncs several notebooks concurrently, at most max_workers at a time.
+    notebooks maps a notebook name to a (notes_dir, remote_repo) tuple.
+    Returns a mapping of notebook name to a (succeeded, message) tuple.
+    """
+    if not notebooks:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(notebooks))) as executor:
+        futures = {
+            name: executor.submit(sync_notebook, notes_dir, remote_repo)
+            for name, (notes_dir, remote_repo) in notebooks.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
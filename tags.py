@@ -0,0 +1,112 @@
+TAG_SEPARATOR = "/"
+WILDCARD = "*"
+
+
+def normalize_tag(tag):
+    """
+    Cleans up a hierarchical tag: surrounding whitespace is removed from every
+    level and empty levels are dropped, so " client//acme/ " becomes "client/acme".
+    Flat tags are returned unchanged apart from surrounding whitespace.
+    """
+    parts = [part.strip() for part in tag.split(TAG_SEPARATOR)]
+    return TAG_SEPARATOR.join(part for part in parts if part)
+
+
+class TagTrie:
+    """
+    Prefix trie over hierarchical tags such as client/acme/infra.
+    Each node stores the notes tagged with exactly that path, so a subtree can be
+    resolved by walking to its root instead of scanning every tag.
+    """
+
+    def __init__(self):
+        self.children = {}
+        self.notes = set()
+
+    def insert(self, tag, note):
+        node = self
+        for part in tag.split(TAG_SEPARATOR):
+            node = node.children.setdefault(part, TagTrie())
+        node.notes.add(note)
+
+    def find(self, tag):
+        """
+        Returns the node for a tag path, or None if no note uses it.
+        """
+        node = self
+        for part in tag.split(TAG_SEPARATOR):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def subtree_notes(self) -> set:
+        """
+        Returns the notes tagged with this node or any tag below it.
+        """
+        notes = set(self.notes)
+        for child in self.children.values():
+            notes |= child.subtree_notes()
+        return notes
+
+    def match(self, pattern) -> set:
+        """
+        Returns the notes matching a tag pattern.
+        A "*" level matches any single level, and a trailing "*" matches the
+        whole subtree including its root, so "client/*" matches "client",
+        "client/acme" and "client/acme/infra". Patterns without wildcards
+        match the exact tag only.
+        """
+        parts = pattern.split(TAG_SEPARATOR)
+        return self._match(parts)
+
+    def _match(self, parts):
+        if not parts:
+            return set(self.notes)
+        part, rest = parts[0], parts[1:]
+        if part == WILDCARD and not rest:
+            return self.subtree_notes()
+        if part == WILDCARD:
+            children = self.children.values()
+        else:
+            child = self.children.get(part)
+            children = [child] if child is not None else []
+        notes = set()
+        for child in children:
+            notes |= child._match(rest)
+        return notes
+
+    def iter_tags(self, prefix=""):
+        """
+        Yields (tag, node) pairs for every node in the trie in sorted order.
+        """
+        for part in sorted(self.children):
+            tag = f"{prefix}{TAG_SEPARATOR}{part}" if prefix else part
+            child = self.children[part]
+            yield tag, child
+            yield from child.iter_tags(tag)
+
+
+def build_tag_trie(notes_metadata) -> TagTrie:
+    """
+    Builds a tag trie from a mapping of filenames to note metadata.
+    """
+    trie = TagTrie()
+    for filename, entry in notes_metadata.items():
+        for tag in entry["tags"]:
+            trie.insert(tag, filename)
+    return trie
+
+
+def print_tag_tree(trie):
+    """
+    Prints the tag hierarchy with the number of notes in each subtree.
+    """
+    if not trie.children:
+        print("No tags found.")
+        return
+    print("Tags:")
+    for tag, node in trie.iter_tags():
+        depth = tag.count(TAG_SEPARATOR)
+        name = tag.rsplit(TAG_SEPARATOR, 1)[-1]
+        print(f"{'  ' * depth}- {name} ({len(node.subtree_notes())})")
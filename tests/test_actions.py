@@ -0,0 +1,102 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import actions
+import note
+
+
+class TestActions(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, date_str, tags, summary):
+        tags_list = ", ".join(f'"{tag}"' for tag in tags)
+        with open(os.path.join(self.notes_dir, filename), "w", encoding="utf-8") as f:
+            f.write(
+                f'---\ntitle: "{filename}"\ndate: "{date_str}"\ntags: [{tags_list}]\n'
+                f"---\n\n# Raw Notes\n- [ ] Not an action item\n\n"
+                f"# Summary\n{summary}\n\n# Reflection\nNone.\n"
+            )
+
+    def test_parse_action_items(self):
+        summary = (
+            "We agreed on the plan.\n"
+            "Action Items:\n"
+            "- [ ] Send the runbook (owner: Alice, due: 2026-03-01)\n"
+            "- [x] Book a room (owner: Bob)\n"
+            "* [ ] Check the logs (see ticket)\n"
+        )
+        self.assertEqual(
+            actions.parse_action_items(summary),
+            [
+                {
+                    "task": "Send the runbook",
+                    "owner": "Alice",
+                    "due": "2026-03-01",
+                    "status": "open",
+                },
+                {"task": "Book a room", "owner": "Bob", "due": None, "status": "done"},
+                {
+                    "task": "Check the logs (see ticket)",
+                    "owner": None,
+                    "due": None,
+                    "status": "open",
+                },
+            ],
+        )
+
+    def test_update_and_filter_action_items(self):
+        self.write_note(
+            "a.md",
+            "20260110090000",
+            ["client/acme"],
+            "- [ ] Send the runbook (owner: Alice, due: 2026-03-01)\n"
+            "- [x] Book a room (owner: Bob, due: 2026-01-20)",
+        )
+        self.write_note(
+            "b.md",
+            "20250610090000",
+            ["internal"],
+            "- [ ] Update the wiki (owner: alice, due: 2025-07-01)",
+        )
+        notes_metadata = note.load_notes_metadata(self.notes_dir)
+        table = actions.update_action_table(self.notes_dir, notes_metadata)
+        self.assertEqual(sorted(table["notes"]), ["a.md", "b.md"])
+
+        results = actions.filter_action_items(table, notes_metadata, owner="ALICE")
+        self.assertEqual([filename for filename, _ in results], ["b.md", "a.md"])
+
+        results = actions.filter_action_items(
+            table, notes_metadata, tags=["client/*"], status="all"
+        )
+        self.assertEqual(len(results), 2)
+
+        results = actions.filter_action_items(
+            table, notes_metadata, since=datetime.datetime(2026, 1, 1)
+        )
+        self.assertEqual([item["task"] for _, item in results], ["Send the runbook"])
+
+        results = actions.filter_action_items(
+            table, notes_metadata, due_before=datetime.datetime(2026, 1, 1)
+        )
+        self.assertEqual([item["task"] for _, item in results], ["Update the wiki"])
+
+    def test_update_action_table_drops_removed_notes(self):
+        self.write_note("a.md", "20260110090000", [], "- [ ] Task")
+        table = actions.update_action_table(
+            self.notes_dir, note.load_notes_metadata(self.notes_dir)
+        )
+        self.assertIn("a.md", table["notes"])
+        os.remove(os.path.join(self.notes_dir, "a.md"))
+        table = actions.update_action_table(
+            self.notes_dir, note.load_notes_metadata(self.notes_dir)
+        )
+        self.assertEqual(table["notes"], {})
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+import archive
+import note
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+        self.write_note("old.md", "20200101090000", ["history"])
+        self.write_note("older.md", "20190101090000", ["history", "client"])
+        self.write_note("new.md", "29990101090000", ["current"])
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, date_str, tags):
+        tags_list = ", ".join(f'"{tag}"' for tag in tags)
+        with open(os.path.join(self.notes_dir, filename), "w", encoding="utf-8") as f:
+            f.write(
+                f'---\ntitle: "{filename}"\ndate: "{date_str}"\ntags: [{tags_list}]\n'
+                f"---\n\n# Raw Notes\nBody of {filename}\n"
+            )
+
+    def test_archive_notes(self):
+        archived = archive.archive_notes(self.notes_dir, 30)
+        self.assertEqual(archived, ["old.md", "older.md"])
+        self.assertFalse(os.path.exists(os.path.join(self.notes_dir, "old.md")))
+        self.assertEqual(
+            sorted(archive.list_archived_notes(self.notes_dir)),
+            ["old.md", "older.md"],
+        )
+        content = archive.read_archived_note(self.notes_dir, "older.md")
+        self.assertIn("Body of older.md", content)
+
+    def test_archived_notes_are_transparent(self):
+        archive.archive_notes(self.notes_dir, 30)
+        self.assertEqual(
+            note.get_note_files(self.notes_dir), ["new.md", "old.md", "older.md"]
+        )
+        self.assertEqual(
+            note.list_all_tags(self.notes_dir), ["client", "current", "history"]
+        )
+        self.assertEqual(
+            note.filter_notes_by_tags(self.notes_dir, ["history"]),
+            ["old.md", "older.md"],
+        )
+        content = note.read_note(os.path.join(self.notes_dir, "old.md"))
+        self.assertIn("Body of old.md", content)
+
+    def test_unarchive_notes(self):
+        archive.archive_notes(self.notes_dir, 30)
+        restored = archive.unarchive_notes(self.notes_dir, ["old.md"])
+        self.assertEqual(restored, ["old.md"])
+        with open(os.path.join(self.notes_dir, "old.md"), "r") as f:
+            self.assertIn("Body of old.md", f.read())
+        self.assertEqual(
+            list(archive.list_archived_notes(self.notes_dir)), ["older.md"]
+        )
+        content = archive.read_archived_note(self.notes_dir, "older.md")
+        self.assertIn("Body of older.md", content)
+
+        self.assertEqual(archive.unarchive_notes(self.notes_dir), ["older.md"])
+        self.assertEqual(archive.list_archived_notes(self.notes_dir), {})
+
+    def test_retag_archived_notes(self):
+        archive.archive_notes(self.notes_dir, 30)
+        changed = note.retag_notes(self.notes_dir, renames={"history": "past"})
+        self.assertEqual(changed, ["old.md", "older.md"])
+        self.assertEqual(
+            note.list_all_tags(self.notes_dir), ["client", "current", "past"]
+        )
+        self.assertEqual(note.filter_notes_by_tags(self.notes_dir, ["history"]), [])
+
+        content = archive.read_archived_note(self.notes_dir, "older.md")
+        self.assertIn('tags: ["past", "client"]', content)
+        self.assertIn("Body of older.md", content)
+
+        archive.unarchive_notes(self.notes_dir, ["old.md"])
+        with open(os.path.join(self.notes_dir, "old.md"), "r") as f:
+            self.assertIn('tags: ["past"]', f.read())
+
+    def test_pack_is_compacted_past_dead_bytes_threshold(self):
+        archive.archive_notes(self.notes_dir, 30)
+        archive_dir = archive.get_archive_dir(self.notes_dir)
+        pack_size = os.path.getsize(os.path.join(archive_dir, "notes-1.pack"))
+
+        # A single rewrite is appended and the old version counted as dead.
+        note.retag_notes(self.notes_dir, add=["past"], required_tags=["client"])
+        table = archive.load_archive_table(self.notes_dir)
+        self.assertEqual(table["pack"], "notes-1.pack")
+        self.assertGreater(
+            os.path.getsize(os.path.join(archive_dir, "notes-1.pack")), pack_size
+        )
+        self.assertGreater(table["dead"], 0)
+
+        # Restoring the other note leaves more dead bytes than live ones.
+        archive.unarchive_notes(self.notes_dir, ["old.md"])
+        table = archive.load_archive_table(self.notes_dir)
+        self.assertEqual(table["pack"], "notes-2.pack")
+        self.assertEqual(table["dead"], 0)
+        self.assertEqual(
+            sorted(os.listdir(archive_dir)), ["notes-2.pack", "notes.json"]
+        )
+        content = archive.read_archived_note(self.notes_dir, "older.md")
+        self.assertIn('"past"', content)
@@ -0,0 +1,85 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import note
+
+
+class TestNoteCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_metadata = {
+            "b.md": {"title": "Béta", "date": "20250208093000", "tags": ["x", "y"]},
+            "a.md": {"title": "Alpha", "date": "", "tags": ["y", "y"]},
+            "c.md": {"title": "", "date": "2024-01-02", "tags": []},
+        }
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def check_catalog(self, catalog):
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual([catalog.path(i) for i in range(3)], ["a.md", "b.md", "c.md"])
+        self.assertEqual(catalog.title(1), "Béta")
+        self.assertEqual(catalog.date(1), datetime.datetime(2025, 2, 8, 9, 30))
+        self.assertIsNone(catalog.date(0))
+        self.assertEqual(catalog.tags(0), ["y"])
+        self.assertEqual(catalog.tags(1), ["x", "y"])
+        self.assertEqual(catalog.tags(2), [])
+        self.assertEqual(catalog.tag_count(), 2)
+        self.assertEqual(catalog.notes_with_tag("y"), [0, 1])
+        self.assertEqual(catalog.notes_with_tag("x"), [1])
+        self.assertEqual(catalog.notes_with_tag("missing"), [])
+
+    def test_from_metadata(self):
+        self.check_catalog(note.NoteCatalog.from_metadata(self.notes_metadata))
+
+    def test_save_and_load(self):
+        path = os.path.join(self.test_dir.name, "catalog.bin")
+        note.NoteCatalog.from_metadata(self.notes_metadata).save(path)
+        catalog = note.NoteCatalog.load(path)
+        try:
+            self.check_catalog(catalog)
+            self.assertIsInstance(catalog.columns["dates"], memoryview)
+        finally:
+            catalog.close()
+
+    def test_load_rejects_other_files(self):
+        path = os.path.join(self.test_dir.name, "other.bin")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 256)
+        with self.assertRaises(ValueError):
+            note.NoteCatalog.load(path)
+
+    def test_close_with_values_in_use(self):
+        path = os.path.join(self.test_dir.name, "catalog.bin")
+        note.NoteCatalog.from_metadata(self.notes_metadata).save(path)
+        catalog = note.NoteCatalog.load(path)
+        tag_ids = catalog.tag_ids(1)
+        catalog.close()
+        self.assertEqual(len(tag_ids), 2)
+        self.assertIsNone(catalog.mapped)
+
+    def test_notes_matching(self):
+        self.notes_metadata["d.md"] = {
+            "title": "",
+            "date": "",
+            "tags": ["client/acme", "client/acme/infra"],
+        }
+        self.notes_metadata["e.md"] = {"title": "", "date": "", "tags": ["client/beta"]}
+        catalog = note.NoteCatalog.from_metadata(self.notes_metadata)
+        self.assertEqual(catalog.notes_matching("client/acme"), {3})
+        self.assertEqual(catalog.notes_matching("client/*"), {3, 4})
+        self.assertEqual(catalog.notes_matching("*/acme/*"), {3})
+        self.assertEqual(catalog.notes_matching("y"), {0, 1})
+        self.assertEqual(catalog.notes_matching("missing"), set())
+
+    @patch("note.CATALOG_LOOKUP_TAGS", 0)
+    def test_notes_matching_in_one_pass(self):
+        catalog = note.NoteCatalog.from_metadata(self.notes_metadata)
+        self.assertEqual(catalog.notes_matching("y"), {0, 1})
+        self.assertEqual(catalog.notes_matching("*"), {0, 1})
+        self.assertEqual(catalog.notes_matching("missing"), set())
@@ -59,3 +59,51 @@ class TestConfig(unittest.TestCase):
         config.set_git_remote(repo)
         settings = config.load_settings()
         self.assertEqual(settings["git_remote"], repo)
+
+    def test_notebooks(self):
+        work_dir = os.path.join(self.test_dir.name, "work")
+        config.set_notes_path(os.path.join(self.test_dir.name, "notes"))
+        config.add_notebook("work", work_dir)
+        config.set_git_remote("https://example.com/work.git", "work")
+        self.assertTrue(os.path.isdir(work_dir))
+
+        settings = config.load_settings()
+        self.assertIsNone(settings.get("git_remote"))
+        notebooks = config.get_notebooks(settings)
+        self.assertEqual(sorted(notebooks), [config.DEFAULT_NOTEBOOK, "work"])
+        self.assertEqual(
+            config.get_notebook(settings, "work"),
+            {"notes_dir": work_dir, "git_remote": "https://example.com/work.git"},
+        )
+        self.assertEqual(config.get_notes_dir(settings), settings["notes_dir"])
+        self.assertEqual(config.get_notes_dir(settings, "work"), work_dir)
+        self.assertIsNone(config.get_notebook(settings, "missing"))
+
+        config.remove_notebook("work")
+        self.assertEqual(
+            list(config.get_notebooks(config.load_settings())),
+            [config.DEFAULT_NOTEBOOK],
+        )
+        self.assertTrue(os.path.isdir(work_dir))
+
+    def test_notebook_without_notes_dir(self):
+        settings = {
+            "notes_dir": self.test_dir.name,
+            "notebooks": {"broken": {"git_remote": "x"}, "empty": None},
+        }
+        with patch("builtins.print") as mock_print:
+            notebooks = config.get_notebooks(settings)
+        self.assertEqual(list(notebooks), [config.DEFAULT_NOTEBOOK])
+        self.assertEqual(mock_print.call_count, 2)
+
+        with patch("builtins.print") as mock_print:
+            config.print_config(settings)
+        printed = "\n".join(call.args[0] for call in mock_print.call_args_list)
+        self.assertNotIn("Notebooks:", printed)
+
+        config.save_settings(settings)
+        notes_dir = os.path.join(self.test_dir.name, "empty")
+        config.add_notebook("empty", notes_dir)
+        self.assertEqual(
+            config.get_notes_dir(config.load_settings(), "empty"), notes_dir
+        )
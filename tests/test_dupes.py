@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+import dupes
+import note
+
+MEETING = (
+    "Discussed the rollout plan for the billing service with the platform team. "
+    "We agreed to ship the migration behind a feature flag next Tuesday and to "
+    "monitor error rates for two days before removing the old code path. "
+    "Alice owns the runbook and Bob will prepare the dashboard."
+)
+
+
+class TestDupes(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, tags, raw_notes, reflection=None):
+        tags_list = ", ".join(f'"{tag}"' for tag in tags)
+        sections = dict(note.NOTE_SECTIONS)
+        sections["Raw Notes"] = raw_notes
+        if reflection:
+            sections["Reflection"] = reflection
+        body = "\n".join(f"# {title}\n{text}\n" for title, text in sections.items())
+        with open(os.path.join(self.notes_dir, filename), "w", encoding="utf-8") as f:
+            f.write(f'---\ntitle: "{filename}"\ntags: [{tags_list}]\n---\n\n{body}')
+
+    def test_template_only_notes_have_no_signature(self):
+        note.create_note("Empty", [], self.notes_dir)
+        filename = os.listdir(self.notes_dir)[0]
+        with open(os.path.join(self.notes_dir, filename), "r") as f:
+            self.assertIsNone(dupes.minhash_signature(f.read()))
+
+    def test_estimate_similarity(self):
+        signature = dupes.minhash_signature(MEETING)
+        self.assertEqual(len(signature), dupes.SIGNATURE_SIZE)
+        self.assertEqual(dupes.estimate_similarity(signature, signature), 1.0)
+        other = dupes.minhash_signature(
+            "An unrelated note about gardening and tomatoes."
+        )
+        self.assertLess(dupes.estimate_similarity(signature, other), 0.2)
+
+    def test_find_duplicates(self):
+        self.write_note("a.md", ["billing"], MEETING)
+        self.write_note("b.md", ["meeting"], MEETING.replace("Tuesday", "Wednesday"))
+        self.write_note(
+            "c.md", [], "Completely different notes about the offsite agenda."
+        )
+        duplicates = dupes.find_duplicates(self.notes_dir)
+        self.assertEqual([pair[1:] for pair in duplicates], [("a.md", "b.md")])
+        self.assertGreater(duplicates[0][0], 0.5)
+
+        stored = dupes.load_signatures(self.notes_dir)["notes"]
+        self.assertEqual(sorted(stored), ["a.md", "b.md", "c.md"])
+
+    def test_merge_notes(self):
+        self.write_note("a.md", ["billing"], MEETING)
+        self.write_note("b.md", ["meeting"], MEETING + " Extra detail.", "Went well.")
+        self.assertTrue(dupes.merge_notes(self.notes_dir, "a.md", "b.md"))
+        self.assertFalse(os.path.exists(os.path.join(self.notes_dir, "b.md")))
+        with open(os.path.join(self.notes_dir, "a.md"), "r") as f:
+            content = f.read()
+        self.assertIn("Extra detail.", note.extract_section(content, "Raw Notes"))
+        self.assertEqual(note.extract_section(content, "Reflection"), "Went well.")
+        self.assertEqual(note.list_all_tags(self.notes_dir), ["billing", "meeting"])
@@ -0,0 +1,166 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import export
+import note
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        self.output_dir = os.path.join(self.test_dir.name, "site")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, title, tags, raw="- Start", mtime_offset=0):
+        path = os.path.join(self.notes_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                f'---\ntitle: "{title}"\ndate: 20260102120000\ntags: {tags}\n---\n\n'
+                f"# Raw Notes\n{raw}\n\n# Connecting\n[Other](Other.md)\n\n"
+                "# Summary\nDone.\n"
+            )
+        # Make sure rewrites within the same second are seen as changes.
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + mtime_offset))
+
+    def export(self, fmt="html", workers=1):
+        return export.export_notes(
+            self.notes_dir,
+            note.load_notes_metadata(self.notes_dir),
+            self.output_dir,
+            fmt,
+            workers,
+        )
+
+    def read_output(self, *parts):
+        with open(os.path.join(self.output_dir, *parts), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_html_export(self):
+        self.write_note("Alpha.md", "Alpha <1>", ["client/acme", "meeting"])
+        self.write_note("Beta.md", "Beta", ["client/beta"])
+        self.assertEqual(self.export(), {"rendered": 2, "unchanged": 0, "removed": 0})
+
+        page = self.read_output("notes", "Alpha.html")
+        self.assertIn("<title>Alpha &lt;1&gt;</title>", page)
+        self.assertIn('<h1 id="raw-notes">Raw Notes</h1>', page)
+        self.assertIn('<a href="#summary">Summary</a>', page)
+        self.assertNotIn("#processing", page)
+        self.assertIn('<a href="Other.html">Other</a>', page)
+        self.assertIn('href="../tags/client/acme.html"', page)
+
+        client_page = self.read_output("tags", "client.html")
+        self.assertIn('href="../notes/Alpha.html"', client_page)
+        self.assertIn('href="../notes/Beta.html"', client_page)
+        self.assertIn('href="../tags/client/acme.html"', client_page)
+        acme_page = self.read_output("tags", "client", "acme.html")
+        self.assertIn('href="../../notes/Alpha.html"', acme_page)
+        self.assertNotIn("Beta", acme_page)
+        self.assertIn(
+            'href="tags/meeting.html">meeting</a> (1)', self.read_output("index.html")
+        )
+
+        manifest = json.loads(self.read_output(export.MANIFEST_FILE))
+        self.assertEqual(sorted(manifest["notes"]), ["Alpha.md", "Beta.md"])
+        self.assertEqual(len(manifest["notes"]["Alpha.md"]["hash"]), 64)
+
+    def test_only_changed_notes_are_rendered(self):
+        self.write_note("Alpha.md", "Alpha", ["a"])
+        self.write_note("Beta.md", "Beta", ["b"])
+        self.export()
+        self.assertEqual(self.export()["rendered"], 0)
+
+        # A touched note with identical content is not rendered again.
+        self.write_note("Alpha.md", "Alpha", ["a"], mtime_offset=5)
+        with patch("export.export_note") as export_note:
+            self.assertEqual(self.export()["rendered"], 0)
+            export_note.assert_not_called()
+
+        # A body edit renders the note but leaves the listings alone.
+        index_path = os.path.join(self.output_dir, "index.html")
+        os.utime(index_path, (0, 0))
+        self.write_note("Alpha.md", "Alpha", ["a"], raw="- Changed", mtime_offset=10)
+        self.assertEqual(self.export()["rendered"], 1)
+        self.assertIn("Changed", self.read_output("notes", "Alpha.html"))
+        self.assertEqual(os.path.getmtime(index_path), 0)
+
+        # A retitle and retag updates the index and both tag pages.
+        self.write_note("Alpha.md", "Renamed", ["c"], raw="- Changed", mtime_offset=15)
+        self.assertEqual(self.export()["rendered"], 1)
+        self.assertIn("Renamed", self.read_output("index.html"))
+        self.assertIn("Renamed", self.read_output("tags", "c.html"))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "tags", "a.html"))
+        )
+
+    def test_tag_pages_do_not_collide(self):
+        self.write_note("Alpha.md", "Alpha", ["c++"])
+        self.write_note("Beta.md", "Beta", ["c"])
+        self.export()
+
+        self.assertNotEqual(
+            export.get_tag_path("c++", "html"), export.get_tag_path("c", "html")
+        )
+        self.assertEqual(export.get_tag_path("a/..", "html"), "tags/a/%2E%2E.html")
+        self.assertIn("Alpha", self.read_output("tags", "c%2B%2B.html"))
+        self.assertNotIn("Beta", self.read_output("tags", "c%2B%2B.html"))
+        self.assertIn("Beta", self.read_output("tags", "c.html"))
+        self.assertIn(
+            'href="tags/c%252B%252B.html">c++</a>', self.read_output("index.html")
+        )
+
+    def test_removed_notes_are_deleted(self):
+        self.write_note("Alpha.md", "Alpha", ["a"])
+        self.write_note("Beta.md", "Beta", ["b"])
+        self.export()
+        os.remove(os.path.join(self.notes_dir, "Beta.md"))
+
+        self.assertEqual(self.export(), {"rendered": 0, "unchanged": 1, "removed": 1})
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "notes", "Beta.html"))
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "tags", "b.html"))
+        )
+        self.assertNotIn("Beta", self.read_output("index.html"))
+
+    def test_json_export(self):
+        self.write_note("Alpha.md", "Alpha", ["client/acme"])
+        self.export("json")
+
+        data = json.loads(self.read_output("notes", "Alpha.json"))
+        self.assertEqual(data["title"], "Alpha")
+        self.assertEqual(data["tags"], ["client/acme"])
+        sections = {section["anchor"]: section["text"] for section in data["sections"]}
+        self.assertEqual(sections["summary"], "Done.")
+        self.assertNotIn("title:", data["body"])
+
+        tag_page = json.loads(self.read_output("tags", "client.json"))
+        self.assertEqual(tag_page["children"], ["client/acme"])
+        self.assertEqual(tag_page["notes"][0]["path"], "../notes/Alpha.json")
+
+        # Switching formats renders everything again.
+        self.assertEqual(self.export("html")["rendered"], 1)
+
+    def test_parallel_export_matches_serial(self):
+        for number in range(4):
+            self.write_note(f"Note{number}.md", f"Note {number}", ["t"])
+        with patch("export.PARALLEL_THRESHOLD", 1):
+            self.assertEqual(self.export(workers=2)["rendered"], 4)
+        parallel = self.read_output("notes", "Note2.html")
+
+        os.remove(os.path.join(self.output_dir, export.MANIFEST_FILE))
+        self.export(workers=1)
+        self.assertEqual(self.read_output("notes", "Note2.html"), parallel)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import datetime
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import history
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+        self.git("init", "-q")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def git(self, *args, timestamp=None):
+        env = dict(os.environ)
+        env.update(
+            {
+                "GIT_AUTHOR_NAME": "Test",
+                "GIT_AUTHOR_EMAIL": "test@example.com",
+                "GIT_COMMITTER_NAME": "Test",
+                "GIT_COMMITTER_EMAIL": "test@example.com",
+            }
+        )
+        if timestamp is not None:
+            env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"{timestamp} +0000"
+        return subprocess.run(
+            ["git", *args],
+            cwd=self.notes_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.strip()
+
+    def commit(self, files, message, timestamp=None):
+        for filename, content in files.items():
+            with open(
+                os.path.join(self.notes_dir, filename), "w", encoding="utf-8"
+            ) as f:
+                f.write(content)
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message, timestamp=timestamp)
+        return self.git("rev-parse", "HEAD")
+
+    def test_no_commits(self):
+        self.assertIsNone(history.update_history_index(self.notes_dir))
+
+    def test_index_records_changed_paths(self):
+        first = self.commit({"a.md": "A1", "b.md": "B1"}, "Add a and b")
+        second = self.commit({"b.md": "B2"}, "Update b")
+
+        index = history.update_history_index(self.notes_dir)
+        self.assertEqual(index["head"], second)
+        self.assertEqual([c["sha"] for c in index["commits"]], [second, first])
+        self.assertEqual(index["commits"][0]["paths"], ["b.md"])
+        self.assertEqual(index["commits"][0]["subject"], "Update b")
+        self.assertEqual(
+            [c["sha"] for c in history.get_file_history(index, "a.md")], [first]
+        )
+
+    def test_incremental_update_reads_only_new_commits(self):
+        first = self.commit({"a.md": "A1"}, "Add a")
+        history.update_history_index(self.notes_dir)
+        second = self.commit({"a.md": "A2"}, "Update a")
+
+        with patch("history.read_commits", wraps=history.read_commits) as read_commits:
+            index = history.update_history_index(self.notes_dir)
+            read_commits.assert_called_once_with(self.notes_dir, f"{first}..{second}")
+        self.assertEqual([c["sha"] for c in index["commits"]], [second, first])
+
+        with patch("history.read_commits") as read_commits:
+            history.update_history_index(self.notes_dir)
+            read_commits.assert_not_called()
+
+    def test_rewritten_history_rebuilds_index(self):
+        self.commit({"a.md": "A1"}, "Add a")
+        self.commit({"a.md": "A2"}, "Update a")
+        history.update_history_index(self.notes_dir)
+
+        self.git("reset", "-q", "--hard", "HEAD~1")
+        amended = self.commit({"c.md": "C1"}, "Add c")
+        index = history.update_history_index(self.notes_dir)
+        self.assertEqual(index["head"], amended)
+        self.assertEqual([c["subject"] for c in index["commits"]], ["Add c", "Add a"])
+
+    def test_changed_since(self):
+        self.commit({"old.md": "1"}, "Old", timestamp=1700000000)
+        self.commit({"new.md": "1"}, "New", timestamp=1800000000)
+        index = history.update_history_index(self.notes_dir)
+
+        since = datetime.datetime.fromtimestamp(1750000000)
+        self.assertEqual(history.get_changed_since(index, since), ["new.md"])
+
+    def test_parse_since(self):
+        self.assertEqual(history.parse_since("2026-03"), datetime.datetime(2026, 3, 1))
+        days_ago = datetime.datetime.now() - history.parse_since("7d")
+        self.assertAlmostEqual(days_ago.total_seconds(), 7 * 86400, delta=60)
+        with self.assertRaises(ValueError):
+            history.parse_since("last week")
+
+    def test_batch_reader_reads_several_objects(self):
+        sha = self.commit({"a.md": "first\n", "b.md": "second\n"}, "Add notes")
+        with history.GitBatchReader(self.notes_dir) as reader:
+            self.assertEqual(reader.read(f"{sha}:a.md"), b"first\n")
+            self.assertIsNone(reader.read(f"{sha}:missing.md"))
+            self.assertEqual(reader.read(f"{sha}:b.md"), b"second\n")
+            self.assertIsNone(reader.read(f"{sha}:a b.md"))
+            self.assertEqual(reader.read(f"{sha}:a.md"), b"first\n")
+
+    def test_previous_version_skips_identical_content(self):
+        first = self.commit({"a.md": "v1\n"}, "v1")
+        second = self.commit({"a.md": "v2\n"}, "v2")
+        self.commit({"b.md": "other\n"}, "unrelated")
+        index = history.update_history_index(self.notes_dir)
+
+        # The working copy matches the last commit, so the previous version is v1.
+        commit, content = history.get_previous_version(
+            self.notes_dir, index, "a.md", "v2\n"
+        )
+        self.assertEqual((commit["sha"], content), (first, "v1\n"))
+
+        # An uncommitted edit compares against the last committed version.
+        commit, content = history.get_previous_version(
+            self.notes_dir, index, "a.md", "v3\n"
+        )
+        self.assertEqual((commit["sha"], content), (second, "v2\n"))
+
+        self.assertIsNone(
+            history.get_previous_version(self.notes_dir, index, "a.md", "v2\n", 2)
+        )
+
+    def test_diff_note_versions(self):
+        diff = history.diff_note_versions("one\ntwo\n", "one\nthree\n", "a.md", "abc")
+        self.assertIn("--- a.md (abc)", diff)
+        self.assertIn("-two", diff)
+        self.assertIn("+three", diff)
+
+
+if __name__ == "__main__":
+    unittest.main()
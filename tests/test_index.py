@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import index
+
+
+class TestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, content):
+        with open(os.path.join(self.notes_dir, filename), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_read_front_matter(self):
+        self.write_note("a.md", '---\ntitle: "A"\n---\n\nBody\n')
+        front_matter, offset = index.read_front_matter(
+            os.path.join(self.notes_dir, "a.md")
+        )
+        self.assertEqual(front_matter, 'title: "A"\n')
+        self.assertEqual(offset, len('---\ntitle: "A"\n---\n'))
+
+    def test_read_front_matter_missing(self):
+        self.write_note("a.md", "# Raw Notes\n")
+        front_matter, offset = index.read_front_matter(
+            os.path.join(self.notes_dir, "a.md")
+        )
+        self.assertEqual((front_matter, offset), ("", 0))
+
+    def test_normalize_tags(self):
+        self.assertEqual(index.normalize_tags(None), [])
+        self.assertEqual(index.normalize_tags(["a", 1]), ["a", "1"])
+        self.assertEqual(index.normalize_tags('a, "b",'), ["a", "b"])
+
+    def test_json_index_round_trip(self):
+        default = {"notes": {}}
+        self.assertEqual(
+            index.load_json_index(self.notes_dir, "x.json", 2, default),
+            {"version": 2, "notes": {}},
+        )
+        index.save_json_index(
+            self.notes_dir, "x.json", {"version": 2, "notes": {"a": 1}}
+        )
+        self.assertEqual(
+            index.load_json_index(self.notes_dir, "x.json", 2, default)["notes"],
+            {"a": 1},
+        )
+        # Indexes written by another version are discarded.
+        self.assertEqual(
+            index.load_json_index(self.notes_dir, "x.json", 3, default),
+            {"version": 3, "notes": {}},
+        )
+
+    def test_is_entry_current(self):
+        entry = {"mtime": 1.0, "size": 10}
+        self.assertTrue(index.is_entry_current({"mtime": 1.0, "size": 10}, entry))
+        self.assertFalse(index.is_entry_current({"mtime": 1.0, "size": 11}, entry))
+        self.assertFalse(index.is_entry_current(None, entry))
+
+    def test_refresh_index(self):
+        self.write_note("a.md", '---\ntitle: "A"\ntags: [x]\n---\n')
+        self.write_note("b.md", '---\ntitle: "B"\ntags: "y, z"\n---\n')
+        notes = index.refresh_index(self.notes_dir)["notes"]
+        self.assertEqual(notes["a.md"]["tags"], ["x"])
+        self.assertEqual(notes["b.md"]["tags"], ["y", "z"])
+
+        os.remove(os.path.join(self.notes_dir, "b.md"))
+        self.write_note("a.md", '---\ntitle: "A"\ntags: [x, w]\n---\n')
+        os.utime(os.path.join(self.notes_dir, "a.md"), (1, 1))
+        notes = index.refresh_index(self.notes_dir)["notes"]
+        self.assertEqual(sorted(notes), ["a.md"])
+        self.assertEqual(notes["a.md"]["tags"], ["x", "w"])
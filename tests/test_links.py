@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import links
+import note
+
+
+class TestLinks(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, title, connecting):
+        path = os.path.join(self.notes_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                f'---\ntitle: "{title}"\ntags: []\n---\n\n'
+                f"# Raw Notes\n[[Ignored]]\n\n# Connecting\n{connecting}\n\n"
+                "# Summary\nNone.\n"
+            )
+        # Make sure rewrites within the same second are seen as changes.
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + len(connecting) / 1000))
+
+    def update(self):
+        return links.update_link_index(
+            self.notes_dir, note.load_notes_metadata(self.notes_dir)
+        )
+
+    def test_extract_links(self):
+        content = (
+            "# Connecting\n"
+            "- [[Other Note|alias]] and [[Third#Heading]]\n"
+            "- [relative](./sub/Fourth.md#part) [web](https://example.com)\n"
+            "- [anchor](#top) ![image](diagram.png)\n"
+            "# Summary\n[[Not Connecting]]\n"
+        )
+        self.assertEqual(
+            links.extract_links(content), ["Other Note", "Third", "./sub/Fourth.md"]
+        )
+
+    def test_backlinks_graph_and_broken_links(self):
+        self.write_note("a.md", "Alpha", "[[Beta]] [[Missing]]")
+        self.write_note("Beta-Notes-20250101000000.md", "Beta Notes", "[c](c.md)")
+        self.write_note("c.md", "Gamma", "")
+        self.write_note("b.md", "Beta", "")
+        link_index = self.update()
+
+        self.assertEqual(links.get_links(link_index, "a.md"), ["b.md"])
+        self.assertEqual(
+            links.get_backlinks(link_index, "c.md"), ["Beta-Notes-20250101000000.md"]
+        )
+        self.assertEqual(links.get_broken_links(link_index), [("a.md", "Missing")])
+        self.assertEqual(
+            links.get_neighbourhood(link_index, "b.md", 1), {"b.md": 0, "a.md": 1}
+        )
+
+    def test_incremental_update(self):
+        self.write_note("a.md", "Alpha", "[[Gamma]]")
+        link_index = self.update()
+        self.assertEqual(links.get_broken_links(link_index), [("a.md", "Gamma")])
+
+        self.write_note("c.md", "Gamma", "[[Alpha]]")
+        link_index = self.update()
+        self.assertEqual(links.get_broken_links(link_index), [])
+        self.assertEqual(links.get_backlinks(link_index, "c.md"), ["a.md"])
+        self.assertEqual(links.get_backlinks(link_index, "a.md"), ["c.md"])
+
+        os.remove(os.path.join(self.notes_dir, "c.md"))
+        link_index = self.update()
+        self.assertEqual(links.get_broken_links(link_index), [("a.md", "Gamma")])
+        self.assertEqual(link_index["reverse"], {})
@@ -94,3 +94,91 @@ class TestNote(unittest.TestCase):
         with open(note_path, "r", encoding="utf-8") as f:
             updated_content = f.read()
         self.assertIn("Generated summary and action items.", updated_content)
+
+    def test_filter_notes_by_tags(self):
+        note.create_note("First", ["alpha", "beta"], self.notes_dir)
+        with open(os.path.join(self.notes_dir, "other.md"), "w") as f:
+            f.write('---\ntitle: "Other"\ntags: [alpha]\n---\n\nBody\n')
+        matching = note.filter_notes_by_tags(self.notes_dir, ["alpha", "beta"])
+        self.assertEqual(len(matching), 1)
+        self.assertEqual(note.list_all_tags(self.notes_dir), ["alpha", "beta"])
+
+    def test_retag(self):
+        tags = note.retag(
+            ["old", "merge-a", "merge-b", "keep"],
+            renames={"old": "new", "merge-a": "merged", "merge-b": "merged"},
+            add=["extra"],
+            remove=["keep"],
+        )
+        self.assertEqual(tags, ["new", "merged", "extra"])
+
+    def test_retag_renames_tag_subtree(self):
+        tags = note.retag(
+            ["client/acme", "client/acme/infra", "client/acmex", "client/beta/x"],
+            renames={"client/acme": "client/acme-corp", "client/beta/x": "y"},
+        )
+        self.assertEqual(
+            tags, ["client/acme-corp", "client/acme-corp/infra", "client/acmex", "y"]
+        )
+
+    def test_replace_front_matter_tags_block_list(self):
+        front_matter = 'title: "T"\ntags:\n- a\n- b\ndate: "1"\n'
+        updated = note.replace_front_matter_tags(front_matter, ["c"])
+        self.assertEqual(updated, 'title: "T"\ntags: ["c"]\ndate: "1"\n')
+
+    def test_retag_notes_preserves_body(self):
+        body = "# Raw Notes\n---\nBody with a rule above.\n"
+        note_path = os.path.join(self.notes_dir, "note.md")
+        with open(note_path, "w", encoding="utf-8") as f:
+            f.write('---\ntitle: "Note"\ntags: ["old", "x"]\n---\n\n' + body)
+        with open(os.path.join(self.notes_dir, "untouched.md"), "w") as f:
+            f.write('---\ntitle: "Untouched"\ntags: ["x"]\n---\n\nBody\n')
+
+        changed = note.retag_notes(self.notes_dir, renames={"old": "new"})
+        self.assertEqual(changed, ["note.md"])
+        with open(note_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertEqual(
+            content, '---\ntitle: "Note"\ntags: ["new", "x"]\n---\n\n' + body
+        )
+        self.assertEqual(note.list_all_tags(self.notes_dir), ["new", "x"])
+
+    def test_retag_notes_with_wildcard_selection(self):
+        note.create_note("Acme", ["client/acme"], self.notes_dir)
+        note.create_note("Globex", ["client/globex/infra"], self.notes_dir)
+        note.create_note("Personal", ["home"], self.notes_dir)
+
+        changed = note.retag_notes(
+            self.notes_dir, add=[" clients // active "], required_tags=["client/*"]
+        )
+        self.assertEqual(len(changed), 2)
+        self.assertEqual(
+            note.filter_notes_by_tags(self.notes_dir, ["clients/active"]), changed
+        )
+
+    def test_get_note_file(self):
+        for fname in ["a.md", "b.md"]:
+            with open(os.path.join(self.notes_dir, fname), "w") as f:
+                f.write("Dummy content")
+        self.assertEqual(
+            note.get_note_file("2", self.notes_dir),
+            os.path.join(self.notes_dir, "b.md"),
+        )
+        self.assertEqual(
+            note.get_note_file("a.md", self.notes_dir),
+            os.path.join(self.notes_dir, "a.md"),
+        )
+        self.assertEqual(note.get_note_file("3", self.notes_dir), "")
+
+    def test_get_note_file_missing_filename_is_not_searched(self):
+        note.create_note("Renamed Note", [], self.notes_dir)
+        with patch("note.find_note_by_title") as find_note_by_title:
+            self.assertEqual(note.get_note_file("renamed-note.md", self.notes_dir), "")
+            self.assertEqual(note.get_note_file("sub/renamed", self.notes_dir), "")
+            find_note_by_title.assert_not_called()
+        self.assertTrue(note.get_note_file("renamed note", self.notes_dir))
+
+    def test_update_section_keeps_backslashes(self):
+        content = "# Summary\nOld summary.\n"
+        updated = note.update_section(content, "Summary", r"Use C:\temp\1 here.")
+        self.assertIn(r"Use C:\temp\1 here.", updated)
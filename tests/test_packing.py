@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import note
+import packing
+
+
+class TestPacking(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, raw_notes):
+        path = os.path.join(self.notes_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(
+                f"# Raw Notes\n{raw_notes}\n\n# Processing\n\n# Connecting\n\n"
+                "# Summary\nOld summary.\n\n# Reflection\nNone.\n"
+            )
+        return path
+
+    def read_summary(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return note.extract_section(f.read(), "Summary")
+
+    def test_count_tokens(self):
+        self.assertGreater(packing.count_tokens("Hello, world! " * 10), 20)
+        self.assertEqual(packing.count_tokens(""), 0)
+
+    def test_pack_notes(self):
+        fixed = packing.count_tokens(packing.build_packed_prompt([]))
+        budget = fixed + 100
+        packs = packing.pack_notes(
+            [("a", 40), ("b", 40), ("c", 40), ("big", 500), ("d", 10)], budget
+        )
+        self.assertEqual(packs, [["a", "b"], ["c"], ["big"], ["d"]])
+
+    def test_pack_notes_limits_notes_per_request(self):
+        note_tokens = [(str(i), 1) for i in range(packing.MAX_NOTES_PER_REQUEST + 1)]
+        packs = packing.pack_notes(note_tokens, 100000)
+        self.assertEqual(
+            [len(pack) for pack in packs], [packing.MAX_NOTES_PER_REQUEST, 1]
+        )
+
+    def test_parse_packed_response(self):
+        response = '```json\n{"1": "First.", "2": "", "3": 4}\n```'
+        self.assertEqual(packing.parse_packed_response(response, 3), {0: "First."})
+        self.assertEqual(packing.parse_packed_response("not json", 2), {})
+        self.assertEqual(packing.parse_packed_response(None, 2), {})
+
+    def test_parse_truncated_packed_response(self):
+        response = '{"1": "First \\"quoted\\".", "2": "Second.", "3": "Cut o'
+        self.assertEqual(
+            packing.parse_packed_response(response, 3),
+            {0: 'First "quoted".', 1: "Second."},
+        )
+
+    @patch("note.get_openai_response")
+    @patch("packing.get_openai_response")
+    def test_summarize_notes_packed(self, mock_packed, mock_single):
+        first = self.write_note("a.md", "Short note one.")
+        second = self.write_note("b.md", "Short note two.")
+        mock_packed.return_value = json.dumps({"1": "Summary of one."})
+        mock_single.return_value = "Summary of two."
+
+        results = packing.summarize_notes_packed([first, second], "token")
+
+        self.assertEqual(mock_packed.call_count, 1)
+        prompt = mock_packed.call_args[0][0]
+        self.assertEqual(prompt.count(note.SUMMARY_INSTRUCTIONS), 1)
+        self.assertIn("=== Note 2 ===", prompt)
+        # The second note was missing from the packed response.
+        self.assertEqual(mock_single.call_count, 1)
+        self.assertEqual(results, {first: "Summary of one.", second: "Summary of two."})
+        self.assertEqual(self.read_summary(first), "Summary of one.")
+        self.assertEqual(self.read_summary(second), "Summary of two.")
+
+    @patch("note.get_openai_response")
+    @patch("packing.get_openai_response")
+    def test_truncated_response_falls_back_for_cut_notes_only(
+        self, mock_packed, mock_single
+    ):
+        paths = [self.write_note(f"{name}.md", f"Note {name}.") for name in "abc"]
+        mock_packed.return_value = (
+            '{"1": "Summary of a.", "2": "Summary of b.", "3": "Su'
+        )
+        mock_single.return_value = "Summary of c."
+
+        results = packing.summarize_notes_packed(paths, "token")
+
+        self.assertEqual(
+            mock_packed.call_args[1]["max_tokens"], 3 * note.SUMMARY_MAX_TOKENS
+        )
+        self.assertEqual(mock_single.call_count, 1)
+        self.assertEqual(
+            [results[path] for path in paths],
+            ["Summary of a.", "Summary of b.", "Summary of c."],
+        )
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+import query
+
+
+class TestQueryParser(unittest.TestCase):
+
+    def test_parse_implicit_and_with_not(self):
+        node = query.parse_query(
+            'tag:acme date>=2026-01 text:"roll back" NOT tag:draft'
+        )
+        self.assertEqual(
+            node,
+            (
+                "and",
+                [
+                    ("predicate", "tag", ":", "acme"),
+                    ("predicate", "date", ">=", "2026-01"),
+                    ("predicate", "text", ":", "roll back"),
+                    ("not", ("predicate", "tag", ":", "draft")),
+                ],
+            ),
+        )
+
+    def test_parse_precedence_and_parentheses(self):
+        node = query.parse_query("tag:a OR tag:b AND (tag:c OR tag:d)")
+        self.assertEqual(node[0], "or")
+        self.assertEqual(node[1][1][0], "and")
+        self.assertEqual(node[1][1][1][1][0], "or")
+
+    def test_parse_errors(self):
+        for bad in ["", "tag:a AND", "(tag:a", "color:red", "tag>a", "date>=soon", "a"]:
+            with self.assertRaises(ValueError):
+                query.parse_query(bad)
+
+    def test_parse_date_range(self):
+        start, end = query.parse_date_range("2026-12")
+        self.assertEqual((start.year, start.month), (2026, 12))
+        self.assertEqual((end.year, end.month, end.day), (2027, 1, 1))
+
+
+class TestQueryNotes(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+        self.write_note("a.md", "20260115090000", ["acme"], "We planned a rollback.")
+        self.write_note("b.md", "20260220090000", ["acme", "draft"], "Rollback again.")
+        self.write_note("c.md", "20251201090000", ["acme"], "Rollback last year.")
+        self.write_note("d.md", "20260301090000", ["globex"], "Rollback elsewhere.")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def write_note(self, filename, date_str, tags, raw_notes):
+        tags_list = ", ".join(f'"{tag}"' for tag in tags)
+        with open(os.path.join(self.notes_dir, filename), "w", encoding="utf-8") as f:
+            f.write(
+                f'---\ntitle: "{filename}"\ndate: "{date_str}"\ntags: [{tags_list}]\n'
+                f"---\n\n# Raw Notes\n{raw_notes}\n\n# Summary\nNothing yet.\n"
+            )
+
+    def test_query_notes(self):
+        matches = query.query_notes(
+            self.notes_dir,
+            'tag:acme AND date>=2026-01 AND text:"rollback" NOT tag:draft',
+        )
+        self.assertEqual(matches, ["a.md"])
+
+    def test_query_sections_and_or(self):
+        self.assertEqual(query.query_notes(self.notes_dir, "summary:rollback"), [])
+        self.assertEqual(
+            query.query_notes(self.notes_dir, "raw:elsewhere OR date<2026"),
+            ["c.md", "d.md"],
+        )
+
+    def test_planner_reads_only_final_candidates(self):
+        planner = query.QueryPlanner(self.notes_dir)
+        node = query.parse_query('text:"rollback" tag:globex')
+        self.assertEqual(planner.run(node), ["d.md"])
+        self.assertEqual(planner.notes_read, 1)
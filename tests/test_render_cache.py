@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import config
+import note
+import render_cache
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.original_config_dir = config.CONFIG_DIR
+        config.CONFIG_DIR = self.test_dir.name
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        config.CONFIG_DIR = self.original_config_dir
+        self.test_dir.cleanup()
+
+    def test_get_rendered_caches_output(self):
+        content = "# Title\n\nSome **bold** text."
+        rendered, hit = render_cache.get_rendered(content, 80, color_system="standard")
+        self.assertFalse(hit)
+        self.assertIn("\x1b[", rendered)
+
+        with patch("render_cache.render_markdown") as mock_render:
+            cached, hit = render_cache.get_rendered(
+                content, 80, color_system="standard"
+            )
+        self.assertTrue(hit)
+        self.assertEqual(cached, rendered)
+        mock_render.assert_not_called()
+
+    def test_cache_key_depends_on_width_and_theme(self):
+        key = render_cache.get_cache_key("text", 80, "monokai", None)
+        self.assertNotEqual(
+            key, render_cache.get_cache_key("text", 100, "monokai", None)
+        )
+        self.assertNotEqual(key, render_cache.get_cache_key("text", 80, "native", None))
+        self.assertNotEqual(
+            key, render_cache.get_cache_key("text!", 80, "monokai", None)
+        )
+
+    def test_evict_removes_least_recently_used(self):
+        for number in range(3):
+            path = os.path.join(self.test_dir.name, f"{number}.ansi")
+            with open(path, "w") as f:
+                f.write("x" * 100)
+            os.utime(path, (number, number))
+        render_cache.evict(self.test_dir.name, 250)
+        remaining = sorted(
+            f for f in os.listdir(self.test_dir.name) if f.endswith(".ansi")
+        )
+        self.assertEqual(remaining, ["1.ansi", "2.ansi"])
+
+    def test_prefetch_renders(self):
+        for title in ["Old", "New"]:
+            note.create_note(title, [], self.notes_dir)
+        note.prefetch_renders(self.notes_dir, 1).join()
+        cache_dir = render_cache.get_cache_dir()
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
@@ -2,6 +2,8 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
@@ -24,6 +26,7 @@ class TestSync(unittest.TestCase):
         with open(gitignore_path, "r") as f:
             content = f.read()
         self.assertIn("settings.yaml", content)
+        self.assertIn(".index/", content)
 
     @patch("subprocess.run")
     def test_init_git_repo(self, mock_run):
@@ -62,3 +65,47 @@ class TestSync(unittest.TestCase):
 
         sync.sync_notes(self.notes_dir, remote_repo)
         self.assertTrue(mock_run.call_count >= 0)
+
+    def test_sync_notebooks_reports_each_notebook(self):
+        remote = os.path.join(self.test_dir.name, "remote.git")
+        subprocess.run(["git", "init", "-q", "--bare", remote], check=True)
+        good = os.path.join(self.test_dir.name, "good")
+        bad = os.path.join(self.test_dir.name, "bad")
+        for notes_dir in (good, bad):
+            os.makedirs(notes_dir)
+            subprocess.run(["git", "init", "-q"], cwd=notes_dir, check=True)
+            for key, value in (("user.name", "Test"), ("user.email", "t@example.com")):
+                subprocess.run(["git", "config", key, value], cwd=notes_dir, check=True)
+            with open(os.path.join(notes_dir, "note.md"), "w") as f:
+                f.write("note")
+
+        results = sync.sync_notebooks(
+            {
+                "good": (good, remote),
+                "bad": (bad, os.path.join(self.test_dir.name, "missing.git")),
+            }
+        )
+        self.assertEqual(results["good"], (True, "committed and pushed changes"))
+        self.assertFalse(results["bad"][0])
+        self.assertIn("git push failed", results["bad"][1])
+
+    def test_sync_notebooks_bounds_parallelism(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_sync(notes_dir, remote_repo, quiet=False):
+            with lock:
+                running.append(notes_dir)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(notes_dir)
+            return False
+
+        notebooks = {str(i): (f"dir{i}", "remote") for i in range(6)}
+        with patch("sync.sync_notes", side_effect=fake_sync):
+            results = sync.sync_notebooks(notebooks, max_workers=2)
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(list(results), list(notebooks))
+        self.assertTrue(all(result[0] for result in results.values()))
@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import note
+import tags
+
+
+class TestTags(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = tags.build_tag_trie(
+            {
+                "a.md": {"tags": ["client/acme/infra", "meeting"]},
+                "b.md": {"tags": ["client/acme"]},
+                "c.md": {"tags": ["client/globex/infra"]},
+                "d.md": {"tags": ["client-acme-infra"]},
+            }
+        )
+
+    def test_normalize_tag(self):
+        self.assertEqual(tags.normalize_tag(" client//acme/ "), "client/acme")
+        self.assertEqual(tags.normalize_tag("flat-tag"), "flat-tag")
+        self.assertEqual(tags.normalize_tag("/"), "")
+
+    def test_exact_match(self):
+        self.assertEqual(self.trie.match("client/acme"), {"b.md"})
+        self.assertEqual(self.trie.match("client-acme-infra"), {"d.md"})
+        self.assertEqual(self.trie.match("client"), set())
+
+    def test_subtree_match(self):
+        self.assertEqual(self.trie.match("client/acme/*"), {"a.md", "b.md"})
+        self.assertEqual(self.trie.match("client/*"), {"a.md", "b.md", "c.md"})
+        self.assertEqual(self.trie.match("missing/*"), set())
+
+    def test_single_level_wildcard(self):
+        self.assertEqual(self.trie.match("client/*/infra"), {"a.md", "c.md"})
+
+    def test_print_tag_tree(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            tags.print_tag_tree(self.trie)
+        lines = output.getvalue().splitlines()
+        self.assertIn("- client (3)", lines)
+        self.assertIn("  - acme (2)", lines)
+        self.assertIn("    - infra (1)", lines)
+        self.assertIn("- client-acme-infra (1)", lines)
+
+
+class TestHierarchicalTagNotes(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_filter_notes_by_tag_subtree(self):
+        note.create_note("Infra", ["client/acme/infra/"], self.notes_dir)
+        note.create_note("Flat", ["legacy"], self.notes_dir)
+        self.assertEqual(
+            note.list_all_tags(self.notes_dir), ["client/acme/infra", "legacy"]
+        )
+        matching = note.filter_notes_by_tags(self.notes_dir, ["client/acme/*"])
+        self.assertEqual(len(matching), 1)
+        self.assertTrue(matching[0].startswith("Infra-"))
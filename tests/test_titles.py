@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import note
+import titles
+
+
+class TestTitles(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.TemporaryDirectory()
+        self.notes_dir = os.path.join(self.test_dir.name, "notes")
+        os.makedirs(self.notes_dir, exist_ok=True)
+        self.metadata = {
+            "a.md": {"title": "Acme infrastructure review"},
+            "b.md": {"title": "Weekly standup"},
+            "c.md": {"title": "Globex kickoff"},
+        }
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_title_trigrams(self):
+        self.assertEqual(titles.title_trigrams("Ab"), {"  a", " ab", "ab "})
+
+    def test_get_note_title_fallback(self):
+        title = titles.get_note_title("Team-Sync-20250208093000.md", {"title": ""})
+        self.assertEqual(title, "Team Sync")
+
+    def test_search_titles(self):
+        title_index = titles.update_title_index(self.notes_dir, self.metadata)
+        matches = titles.search_titles(title_index, "infra reveiw")
+        self.assertEqual(matches[0][1], "a.md")
+        self.assertEqual(titles.search_titles(title_index, "zzz"), [])
+
+    def test_search_titles_with_common_words(self):
+        words = ["weekly", "team", "sync", "notes", "review", "planning"]
+        title_index = titles.new_title_index()
+        for number in range(2000):
+            title = " ".join(words[(number + offset) % 6] for offset in (0, 2, 3))
+            titles.add_title(title_index, f"{number:04d}.md", title.capitalize())
+        titles.add_title(title_index, "target.md", "Weekly team sync")
+
+        matches = titles.search_titles(title_index, "weekly team sync", limit=3)
+        self.assertEqual(matches[0][1], "target.md")
+        self.assertFalse(titles.is_ambiguous(matches))
+
+    def test_update_title_index_incremental(self):
+        titles.update_title_index(self.notes_dir, self.metadata)
+        self.metadata["b.md"] = {"title": "Retro"}
+        del self.metadata["c.md"]
+        title_index = titles.update_title_index(self.notes_dir, self.metadata)
+        self.assertEqual(sorted(title_index["ids"]), ["a.md", "b.md"])
+        self.assertEqual(titles.search_titles(title_index, "retro")[0][1], "b.md")
+        self.assertEqual(titles.search_titles(title_index, "standup"), [])
+        self.assertEqual(titles.search_titles(title_index, "globex"), [])
+
+    def test_title_index_is_saved_after_many_changes(self):
+        title_file = os.path.join(self.notes_dir, ".index", titles.TITLES_FILE)
+        titles.update_title_index(self.notes_dir, self.metadata)
+        self.assertFalse(os.path.exists(title_file))
+
+        metadata = {
+            f"{number}.md": {"title": f"Note {number}"}
+            for number in range(titles.MAX_PENDING_CHANGES + 1)
+        }
+        metadata["a.md"] = {"title": "Acme infrastructure review"}
+        titles.update_title_index(self.notes_dir, metadata)
+        self.assertTrue(os.path.exists(title_file))
+
+        # Small changes are applied in memory without rewriting the file.
+        mtime = os.path.getmtime(title_file)
+        metadata["a.md"] = {"title": "Globex kickoff"}
+        del metadata["0.md"]
+        with patch("titles.save_title_index") as save_title_index:
+            title_index = titles.update_title_index(self.notes_dir, metadata)
+            save_title_index.assert_not_called()
+        self.assertEqual(os.path.getmtime(title_file), mtime)
+        self.assertEqual(title_index["pending"], 3)
+        self.assertEqual(titles.search_titles(title_index, "globex")[0][1], "a.md")
+        self.assertEqual(titles.search_titles(title_index, "acme infra"), [])
+        self.assertNotIn(
+            "0.md", [f for _, f, _ in titles.search_titles(title_index, "note 0")]
+        )
+
+        loaded = titles.load_title_index(self.notes_dir)
+        self.assertEqual(len(loaded["ids"]), len(metadata) + 1)
+        self.assertEqual(
+            titles.search_titles(loaded, "note 17")[0][1:], ("17.md", "Note 17")
+        )
+
+    def test_is_ambiguous(self):
+        self.assertFalse(titles.is_ambiguous([(0.9, "a.md", "A")]))
+        self.assertTrue(titles.is_ambiguous([(0.9, "a.md", "A"), (0.8, "b.md", "B")]))
+        self.assertFalse(titles.is_ambiguous([(0.9, "a.md", "A"), (0.3, "b.md", "B")]))
+
+    @patch("builtins.input", return_value="2")
+    def test_pick_note(self, mock_input):
+        matches = [(0.9, "a.md", "A"), (0.8, "b.md", "B")]
+        self.assertEqual(titles.pick_note(matches), "b.md")
+
+    def test_get_note_file_by_title(self):
+        note.create_note("Acme infrastructure review", [], self.notes_dir)
+        note.create_note("Weekly standup", [], self.notes_dir)
+        note_file = note.get_note_file("acme infra", self.notes_dir)
+        self.assertTrue(os.path.basename(note_file).startswith("Acme-infrastructure"))
+        self.assertEqual(note.get_note_file("nothing like it", self.notes_dir), "")
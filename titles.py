@@ -0,0 +1,350 @@
+import array
+import bisect
+import heapq
+import os
+import re
+import struct
+from collections import Counter
+
+from index import atomic_write, get_index_dir
+
+TITLES_FILE = "titles.bin"
+LEGACY_TITLES_FILE = "titles.json"
+TITLES_MAGIC = b"NNTITLE2"
+# Magic, then the byte sizes of the names, grams, offsets, postings and sizes
+# sections.
+TITLES_HEADER = struct.Struct("<8sQQQQQ")
+MIN_SCORE = 0.2
+AMBIGUITY_RATIO = 0.8
+STOP_GRAM_RATIO = 0.05
+CANDIDATES_PER_RESULT = 5
+# Title changes since the index file was written are applied in memory when it
+# is loaded. The file is rewritten only once there are more than this many.
+MAX_PENDING_CHANGES = 256
+
+
+def title_trigrams(title) -> set:
+    """
+    Returns the set of trigrams of a title. Words are lowercased and padded
+    so that the start and end of each word form trigrams of their own.
+    """
+    grams = set()
+    for word in re.findall(r"\w+", title.lower()):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i : i + 3])
+    return grams
+
+
+def get_note_title(filename, entry):
+    """
+    Returns the title of a note, falling back to its filename without the
+    timestamp added by create_note.
+    """
+    if entry.get("title"):
+        return entry["title"]
+    stem = filename[:-3] if filename.endswith(".md") else filename
+    return re.sub(r"-\d{14}$", "", stem).replace("-", " ")
+
+
+def new_title_index():
+    """
+    Returns an empty title index.
+
+    Notes are numbered in the order they were added: filenames, titles and
+    sizes (the number of distinct trigrams of each title) are lists indexed by
+    note ID, and ids maps filenames back to their ID. The postings of the saved
+    index are one sorted array of note IDs per trigram, stored back to back,
+    with grams mapping each trigram to its slice. Notes added since the index
+    was loaded have their postings in added, and removed notes keep their ID
+    with a title of None until the index is saved again.
+    """
+    return {
+        "filenames": [],
+        "titles": [],
+        "sizes": [],
+        "ids": {},
+        "grams": {},
+        "postings": array.array("I"),
+        "added": {},
+        "removed": set(),
+        "pending": 0,
+    }
+
+
+def load_title_index(notes_dir):
+    """
+    Loads the title index. Returns an empty index if it does not exist or
+    cannot be read.
+    """
+    title_file = os.path.join(get_index_dir(notes_dir), TITLES_FILE)
+    try:
+        with open(title_file, "rb") as f:
+            data = f.read()
+        magic, *section_sizes = TITLES_HEADER.unpack_from(data)
+        if magic != TITLES_MAGIC:
+            return new_title_index()
+        sections = []
+        position = TITLES_HEADER.size
+        for size in section_sizes:
+            sections.append(data[position : position + size])
+            position += size
+        names = sections[0].decode("utf-8").split("\0") if sections[0] else []
+        gram_names = sections[1].decode("utf-8").split("\0") if sections[1] else []
+        offsets = array.array("I", sections[2])
+        postings = array.array("I", sections[3])
+        sizes = array.array("I", sections[4])
+    except (OSError, struct.error, ValueError):
+        return new_title_index()
+    if (
+        len(names) != 2 * len(sizes)
+        or len(offsets) != len(gram_names) + 1
+        or offsets[-1] != len(postings)
+    ):
+        return new_title_index()
+
+    title_index = new_title_index()
+    title_index["filenames"] = filenames = names[0::2]
+    title_index["titles"] = names[1::2]
+    title_index["sizes"] = sizes.tolist()
+    title_index["ids"] = dict(zip(filenames, range(len(filenames))))
+    title_index["grams"] = {
+        gram: (offsets[i], offsets[i + 1]) for i, gram in enumerate(gram_names)
+    }
+    title_index["postings"] = postings
+    return title_index
+
+
+def save_title_index(notes_dir, title_index):
+    """
+    Atomically writes the title index with removed notes dropped. Notes are
+    numbered again from zero in order of their number of trigrams, so that
+    search_titles can prefer the notes that score higher on the same number of
+    shared trigrams by comparing IDs.
+    """
+    live = sorted(
+        (
+            (size, filename, title)
+            for filename, title, size in zip(
+                title_index["filenames"], title_index["titles"], title_index["sizes"]
+            )
+            if title is not None
+        ),
+        key=lambda entry: entry[0],
+    )
+    gram_postings = {}
+    for note_id, (_, _, title) in enumerate(live):
+        for gram in title_trigrams(title):
+            gram_postings.setdefault(gram, []).append(note_id)
+
+    offsets = array.array("I", [0])
+    postings = array.array("I")
+    for posting in gram_postings.values():
+        postings.extend(posting)
+        offsets.append(len(postings))
+    sections = [
+        "\0".join(name for _, *entry in live for name in entry).encode("utf-8"),
+        "\0".join(gram_postings).encode("utf-8"),
+        offsets.tobytes(),
+        postings.tobytes(),
+        array.array("I", [size for size, _, _ in live]).tobytes(),
+    ]
+    header = TITLES_HEADER.pack(TITLES_MAGIC, *map(len, sections))
+    index_dir = get_index_dir(notes_dir)
+    atomic_write(os.path.join(index_dir, TITLES_FILE), header + b"".join(sections))
+    try:
+        os.remove(os.path.join(index_dir, LEGACY_TITLES_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def remove_title(title_index, filename):
+    note_id = title_index["ids"].pop(filename)
+    title_index["titles"][note_id] = None
+    title_index["removed"].add(note_id)
+    title_index["pending"] += 1
+
+
+def add_title(title_index, filename, title):
+    # Names are stored NUL separated.
+    title = title.replace("\0", "")
+    grams = title_trigrams(title)
+    note_id = len(title_index["filenames"])
+    title_index["filenames"].append(filename)
+    title_index["titles"].append(title)
+    title_index["sizes"].append(len(grams))
+    title_index["ids"][filename] = note_id
+    added = title_index["added"]
+    for gram in grams:
+        added.setdefault(gram, []).append(note_id)
+    title_index["pending"] += 1
+
+
+def get_posting(title_index, gram):
+    """
+    Returns the sorted IDs of the notes whose title has a trigram, including
+    removed notes that have not been dropped from the saved postings yet.
+    """
+    start, end = title_index["grams"].get(gram, (0, 0))
+    posting = title_index["postings"][start:end]
+    added = title_index["added"].get(gram)
+    return posting + array.array("I", added) if added else posting
+
+
+def contains(posting, note_id):
+    position = bisect.bisect_left(posting, note_id)
+    return position < len(posting) and posting[position] == note_id
+
+
+def count_cutoff(shared, wanted):
+    """
+    Returns the shared trigram count of the wanted-th best candidate, and how
+    many candidates share more trigrams than that.
+    """
+    tiers = Counter(shared.values())
+    kept = 0
+    cutoff = 0
+    for cutoff in sorted(tiers, reverse=True):
+        if kept + tiers[cutoff] >= wanted:
+            break
+        kept += tiers[cutoff]
+    return cutoff, kept
+
+
+def update_title_index(notes_dir, notes_metadata):
+    """
+    Brings the trigram index in line with the metadata index.
+    Added, renamed and removed notes are applied to the loaded index, and the
+    index file is rewritten only once more than MAX_PENDING_CHANGES titles
+    differ from it. Returns the updated title index.
+    """
+    title_index = load_title_index(notes_dir)
+    ids = title_index["ids"]
+    titles = title_index["titles"]
+
+    for filename in ids.keys() - notes_metadata.keys():
+        remove_title(title_index, filename)
+
+    for filename, entry in notes_metadata.items():
+        title = entry.get("title") or get_note_title(filename, entry)
+        note_id = ids.get(filename)
+        if note_id is not None:
+            if titles[note_id] == title:
+                continue
+            remove_title(title_index, filename)
+        add_title(title_index, filename, title)
+
+    if title_index["pending"] > MAX_PENDING_CHANGES:
+        save_title_index(notes_dir, title_index)
+    return title_index
+
+
+def score_title(query_grams, query_lower, title):
+    """
+    Returns the Jaccard similarity of the query and title trigrams.
+    A title containing the query verbatim scores at least 0.9.
+    """
+    title_grams = title_trigrams(title)
+    shared = len(query_grams & title_grams)
+    score = shared / (len(query_grams) + len(title_grams) - shared)
+    if query_lower in title.lower():
+        score = max(score, 0.9)
+    return score
+
+
+def search_titles(title_index, query, limit=10) -> list:
+    """
+    Ranks notes by the trigram similarity of their title to the query.
+    Returns up to limit (score, filename, title) tuples, best match first.
+
+    Candidates are gathered by counting shared trigrams over the posting lists,
+    rarest first. Trigrams so common that they say little about the match (such
+    as the start of a frequent word) do not add new candidates once some have
+    been found, but still count towards the candidates already gathered, so a
+    title made of common words is not ranked on a single posting list. Before
+    each common trigram, candidates that cannot reach the best ones even by
+    sharing every remaining trigram are dropped. The counts of the remaining
+    candidates are exact, so their similarity is computed without looking at
+    their titles' trigrams again.
+    """
+    query_grams = title_trigrams(query)
+    if not query_grams:
+        return []
+
+    wanted = CANDIDATES_PER_RESULT * limit
+    stop_size = max(len(title_index["ids"]) * STOP_GRAM_RATIO, wanted)
+    postings = sorted((get_posting(title_index, gram) for gram in query_grams), key=len)
+
+    shared = Counter()
+    for position, posting in enumerate(postings):
+        if not shared or len(posting) <= stop_size:
+            shared.update(posting)
+            continue
+        cutoff, _ = count_cutoff(shared, wanted)
+        reachable = cutoff - (len(postings) - position)
+        if min(shared.values()) < reachable:
+            shared = Counter(
+                {
+                    note_id: count
+                    for note_id, count in shared.items()
+                    if count >= reachable
+                }
+            )
+        if len(shared) * 16 < len(posting):
+            # Postings are sorted, so a few candidates are looked up rather
+            # than walking a long posting.
+            shared.update(
+                note_id for note_id in list(shared) if contains(posting, note_id)
+            )
+        else:
+            shared.update(shared.keys() & posting)
+    for note_id in title_index["removed"]:
+        shared.pop(note_id, None)
+
+    # Of the notes tied at the cutoff, the lowest IDs are kept: saved notes
+    # are numbered by their number of trigrams, which decides the similarity
+    # of notes sharing as many trigrams with the query.
+    cutoff, kept = count_cutoff(shared, wanted)
+    candidates = [note_id for note_id, count in shared.items() if count > cutoff]
+    tied = [note_id for note_id, count in shared.items() if count == cutoff]
+    candidates += heapq.nsmallest(wanted - kept, tied)
+
+    query_lower = query.strip().lower()
+    titles = title_index["titles"]
+    sizes = title_index["sizes"]
+    results = []
+    for note_id in candidates:
+        title = titles[note_id]
+        count = shared[note_id]
+        score = count / (len(query_grams) + sizes[note_id] - count)
+        if query_lower in title.lower():
+            score = max(score, 0.9)
+        if score >= MIN_SCORE:
+            results.append((round(score, 3), title_index["filenames"][note_id], title))
+    results.sort(key=lambda result: (-result[0], result[1]))
+    return results[:limit]
+
+
+def is_ambiguous(matches) -> bool:
+    """
+    Returns True if the best match does not clearly beat the runner-up.
+    """
+    return len(matches) > 1 and matches[1][0] >= matches[0][0] * AMBIGUITY_RATIO
+
+
+def pick_note(matches):
+    """
+    Asks the user to choose one of several matching notes.
+    Returns the chosen filename, or None if nothing was chosen.
+    """
+    print("Several notes match:")
+    for position, (score, filename, title) in enumerate(matches, start=1):
+        print(f"{position} {title} ({filename})")
+    try:
+        choice = input("Select a note number: ").strip()
+    except EOFError:
+        return None
+    if not choice.isdigit() or not 1 <= int(choice) <= len(matches):
+        print("Invalid selection.")
+        return None
+    return matches[int(choice) - 1][1]